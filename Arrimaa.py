@@ -1,7 +1,21 @@
+import logging
+import os
 import pygame
-import random
+import sys
 import time
 
+from arimaa import (
+    GameState, Searcher, GOLD, SILVER, EMPTY, COLOR_NAMES, PIECE_TYPES, STEPS_PER_TURN,
+    get_evaluator, load_weights, generate_piece_moves, square, square_coords,
+)
+from arimaa.background import BackgroundSearch
+from arimaa.search import format_move, log_iteration
+from sprites import PieceImages
+
+# Registro de la IA; apagado salvo que se configure logging con nivel DEBUG
+logger = logging.getLogger("arimaa")
+start_time = time.perf_counter()
+
 # Inicializar Pygame
 pygame.init()
 
@@ -20,7 +34,19 @@ PULL_HIGHLIGHT_COLOR = (255, 255, 0)  # Amarillo para resaltar opciones de jalar
 
 # Crear ventana
 screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Arimaa - Proyecto Final")
+CAPTION = "Arimaa - Proyecto Final"
+pygame.display.set_caption(CAPTION)
+
+# Cuadros por segundo como máximo mientras hay animación; sin cambios el bucle
+# espera eventos. Se puede cambiar con la variable de entorno ARIMAA_FPS.
+FRAME_RATE = int(os.environ.get("ARIMAA_FPS", 60))
+PROGRESS_INTERVAL = 0.25  # Segundos entre actualizaciones del avance de la IA
+AI_EVENT = pygame.USEREVENT + 1  # La búsqueda en segundo plano dejó un turno
+# Solo despiertan al bucle los eventos que se atienden (no el movimiento del ratón)
+pygame.event.set_blocked(None)
+pygame.event.set_allowed([pygame.QUIT, pygame.MOUSEBUTTONDOWN, pygame.KEYDOWN, pygame.VIDEOEXPOSE, AI_EVENT])
+# Teclas con las que el jugador pasa el turno antes de usar todos los pasos
+END_TURN_KEYS = (pygame.K_RETURN, pygame.K_KP_ENTER, pygame.K_SPACE)
 
 # Trampas en el tablero
 TRAP_POSITIONS = [(2, 2), (2, 5), (5, 2), (5, 5)]
@@ -30,62 +56,32 @@ PIECE_COLORS = {
     "gold": (255, 223, 0),  # Oro
     "silver": (192, 192, 192)  # Plata
 }
-PIECE_SYMBOLS = {
-    "E": 6,  # Elefante
-    "C": 5,  # Camello
-    "H": 4,  # Caballo
-    "D": 3,  # Perro
-    "G": 2,  # Gato
-    "R": 1   # Conejo
-}
-# Cargar y redimensionar imágenes de las piezas
-def load_and_scale_image(path, size):
-    image = pygame.image.load(path)
-    return pygame.transform.scale(image, size)
-
-PIECE_IMAGES = {
-    "gold_E": load_and_scale_image("gold_elephant.png", (TILE_SIZE, TILE_SIZE)),
-    "gold_C": load_and_scale_image("gold_camel.png", (TILE_SIZE, TILE_SIZE)),
-    "gold_H": load_and_scale_image("gold_horse.png", (TILE_SIZE, TILE_SIZE)),
-    "gold_D": load_and_scale_image("gold_dog.png", (TILE_SIZE, TILE_SIZE)),
-    "gold_G": load_and_scale_image("gold_cat.png", (TILE_SIZE, TILE_SIZE)),
-    "gold_R": load_and_scale_image("gold_rabbit.png", (TILE_SIZE, TILE_SIZE)),
-    "silver_E": load_and_scale_image("silver_elephant.png", (TILE_SIZE, TILE_SIZE)),
-    "silver_C": load_and_scale_image("silver_camel.png", (TILE_SIZE, TILE_SIZE)),
-    "silver_H": load_and_scale_image("silver_horse.png", (TILE_SIZE, TILE_SIZE)),
-    "silver_D": load_and_scale_image("silver_dog.png", (TILE_SIZE, TILE_SIZE)),
-    "silver_G": load_and_scale_image("silver_cat.png", (TILE_SIZE, TILE_SIZE)),
-    "silver_R": load_and_scale_image("silver_rabbit.png", (TILE_SIZE, TILE_SIZE))
-}
-
-# Generar posiciones iniciales para los jugadores
-def generate_random_positions():
-    pieces = [
-        "E", "C", "H", "H", "D", "D", "G", "G",
-        "R", "R", "R", "R", "R", "R", "R", "R"
-    ]
-    random.shuffle(pieces)
-    positions = []
-    available_slots = [(row, col) for row in range(2) for col in range(COLS)]
-    random.shuffle(available_slots)
-
-    for piece in pieces:
-        x, y = available_slots.pop()
-        positions.append((x, y, piece))
-
-    return positions
-
-# Inicializar posiciones iniciales
-INITIAL_POSITIONS = {
-    "gold": generate_random_positions(),
-    "silver": [(x + 6, y, piece) for x, y, piece in generate_random_positions()]
-}
-
-# Variables de estado
+# Imágenes de las piezas por código, desde el atlas de sprites.py; se cargan
+# al dibujar la primera pieza, con la ventana ya creada
+PIECE_IMAGES = PieceImages(TILE_SIZE)
+
+# Estado de la partida (tablero, turno y movimientos restantes)
+state = GameState.new_game()
+
+# Heurística de la IA, por nombre del registro: "board" (aliados adyacentes)
+# o "column" (columna 0). Uso: python Arrimaa.py [heurística]
+# Los pesos ajustados de arimaa/weights.json (o de ARIMAA_WEIGHTS), si existe,
+# reemplazan a los del registro.
+load_weights()
+evaluator = get_evaluator(sys.argv[1] if len(sys.argv) > 1 else "board")
+
+# Motor de la IA; busca en un hilo aparte para no congelar la ventana y avisa
+# con AI_EVENT cuando tiene el turno
+searcher = Searcher(evaluate=evaluator, time_limit=2.0, on_iteration=log_iteration)
+ai = BackgroundSearch(searcher, on_result=lambda: pygame.event.post(pygame.event.Event(AI_EVENT)))
+STEP_DELAY = 0.5  # Segundos entre los pasos de la IA que se muestran
+ai_steps = None  # Pasos del turno de la IA que faltan mostrar (None mientras piensa)
+next_step_time = 0.0
+result = None  # Ganador; se revisa solo después de mover
+ai.ponder(state)  # Oro empieza; la IA piensa mientras tanto
+
+# Variables de estado de la interfaz
 selected_square = None
-selected_piece = None
-current_turn = "gold"  # Turno inicial
-remaining_moves = 4  # Movimientos por turno
 push_mode = False
 push_options = []  # Opciones para empujar
 piece_to_push = None
@@ -93,382 +89,270 @@ pull_mode = False
 pull_options = []  # Opciones para jalar
 piece_to_pull = None
 valid_moves = []  # Movimientos válidos para la pieza seleccionada
+piece_moves = []  # Movimientos del generador para la pieza seleccionada
+
+VALID_MOVE_COLOR = (255, 255, 255)  # Blanco para los movimientos válidos
+
+# Capa fija del tablero (casillas y trampas), dibujada una sola vez
+board_surface = None
+# Aspecto de cada casilla en el último cuadro dibujado; None obliga a redibujar todo
+drawn_views = None
+
+def get_board_surface():
+    global board_surface
+    if board_surface is None:
+        board_surface = pygame.Surface((WIDTH, HEIGHT)).convert()
+        for row in range(ROWS):
+            for col in range(COLS):
+                color = LIGHT_COLOR if (row + col) % 2 == 0 else DARK_COLOR
+                pygame.draw.rect(board_surface, color, (col * TILE_SIZE, row * TILE_SIZE, TILE_SIZE, TILE_SIZE))
+
+        for trap in TRAP_POSITIONS:
+            x, y = trap
+            pygame.draw.circle(
+                board_surface, TRAP_COLOR,
+                (y * TILE_SIZE + TILE_SIZE // 2, x * TILE_SIZE + TILE_SIZE // 2),
+                TILE_SIZE // 4
+            )
+    return board_surface
 
-# Dibujar el tablero
-def draw_board():
-    for row in range(ROWS):
-        for col in range(COLS):
-            color = LIGHT_COLOR if (row + col) % 2 == 0 else DARK_COLOR
-            pygame.draw.rect(screen, color, (col * TILE_SIZE, row * TILE_SIZE, TILE_SIZE, TILE_SIZE))
-
-    for trap in TRAP_POSITIONS:
-        x, y = trap
-        pygame.draw.circle(
-            screen, TRAP_COLOR,
-            (y * TILE_SIZE + TILE_SIZE // 2, x * TILE_SIZE + TILE_SIZE // 2),
-            TILE_SIZE // 4
-        )
-
+# Aspecto de cada casilla: (código de pieza, colores de resaltado en orden de dibujo)
+def square_views():
+    highlights = {}
+    marked = []
     if selected_square:
-        sx, sy = selected_square
-        pygame.draw.rect(screen, HIGHLIGHT_COLOR,
-                         (sy * TILE_SIZE, sx * TILE_SIZE, TILE_SIZE, TILE_SIZE), 5)  
-
+        marked.append(([selected_square], HIGHLIGHT_COLOR))
     if push_mode:
-        for px, py in push_options:
-            pygame.draw.rect(screen, PUSH_HIGHLIGHT_COLOR,
-                             (py * TILE_SIZE, px * TILE_SIZE, TILE_SIZE, TILE_SIZE), 5)
-
+        marked.append((push_options, PUSH_HIGHLIGHT_COLOR))
     if pull_mode:
-        for px, py in pull_options:
-            pygame.draw.rect(screen, PULL_HIGHLIGHT_COLOR,
-                             (py * TILE_SIZE, px * TILE_SIZE, TILE_SIZE, TILE_SIZE), 5)
-    # Dibujar movimientos válidos
-    for vx, vy in valid_moves:
-        pygame.draw.rect(screen, (255, 255, 255), (vy * TILE_SIZE, vx * TILE_SIZE, TILE_SIZE, TILE_SIZE), 5)  
-
-# Dibujar piezas
-def draw_pieces():
-    for color, positions in INITIAL_POSITIONS.items():
-        for x, y, piece in positions:
-            piece_image = PIECE_IMAGES[f"{color}_{piece}"]
-            piece_rect = piece_image.get_rect(center=(y * TILE_SIZE + TILE_SIZE // 2, x * TILE_SIZE + TILE_SIZE // 2))
-            screen.blit(piece_image, piece_rect)
+        marked.append((pull_options, PULL_HIGHLIGHT_COLOR))
+    marked.append((valid_moves, VALID_MOVE_COLOR))
+    for positions, color in marked:
+        for x, y in positions:
+            highlights.setdefault(square(x, y), []).append(color)
+    return [(code, tuple(highlights.get(sq, ()))) for sq, code in enumerate(state.board.squares)]
+
+# Dibujar una casilla sobre la capa fija: resaltados y pieza. Devuelve su rectángulo.
+def draw_square(sq, view):
+    x, y = square_coords(sq)
+    rect = pygame.Rect(y * TILE_SIZE, x * TILE_SIZE, TILE_SIZE, TILE_SIZE)
+    screen.blit(get_board_surface(), rect, rect)
+    code, highlights = view
+    for color in highlights:
+        pygame.draw.rect(screen, color, rect, 5)
+    if code != EMPTY:
+        screen.blit(PIECE_IMAGES[code], rect)
+    return rect
+
+# Dibujar solo las casillas que cambiaron desde el último cuadro (movimientos,
+# capturas o resaltados) y actualizar esos rectángulos de la pantalla
+def draw():
+    global drawn_views
+    views = square_views()
+    if drawn_views is None:
+        screen.blit(get_board_surface(), (0, 0))
+        for sq, view in enumerate(views):
+            draw_square(sq, view)
+        pygame.display.flip()
+    else:
+        dirty = [draw_square(sq, view) for sq, view in enumerate(views) if view != drawn_views[sq]]
+        if dirty:
+            pygame.display.update(dirty)
+    drawn_views = views
 
 
+# Aplicar un movimiento y ver si terminó la partida: solo puede terminar al
+# mover, así que no hace falta revisarlo en cada cuadro
+def play_move(move):
+    global result
+    state.apply_move(move)
+    result = state.winner()
+
 # Encontrar pieza en una posición
 def find_piece(position):
-    for color, positions in INITIAL_POSITIONS.items():
-        for x, y, piece in positions:
-            if (x, y) == position:
-                return color, piece
-    return None, None
-
-# Mover pieza
-def move_piece(start, end):
-    for color, positions in INITIAL_POSITIONS.items():
-        for i, (x, y, piece) in enumerate(positions):
-            if (x, y) == start:
-                positions[i] = (end[0], end[1], piece)
-                return
-
-# Validar movimiento
-def is_valid_move(start, end):
-    sx, sy = start
-    ex, ey = end
-    dx, dy = abs(ex - sx), abs(ey - sy)
-
-    if dx + dy != 1:
-        return False
-
-    for positions in INITIAL_POSITIONS.values():
-        for px, py, _ in positions:
-            if (px, py) == end:
-                return False
-
-    return True
-
-# Generar opciones de empuje (solo adyacentes en línea recta)
-def generate_push_options(target_pos, pusher_pos):
-    tx, ty = target_pos
-    px, py = pusher_pos
-    options = []
-    
-    # Solo se consideran los movimientos adyacentes en las direcciones rectas (arriba, abajo, izquierda, derecha)
-    for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-        new_x, new_y = tx + dx, ty + dy
-        # Asegurarse de que las posiciones sean dentro de los límites del tablero y no sean la posición del empujador
-        if 0 <= new_x < ROWS and 0 <= new_y < COLS and (new_x, new_y) != (px, py):
-            # Verificar si la nueva casilla está vacía (sin piezas)
-            if not any((nx, ny) == (new_x, new_y) for nx, ny, _ in INITIAL_POSITIONS["gold"] + INITIAL_POSITIONS["silver"]):
-                options.append((new_x, new_y))
-    return options
-
-# Verificar si una pieza está adyacente a otra
-def is_adjacent(pos1, pos2):
-    x1, y1 = pos1
-    x2, y2 = pos2
-    return (abs(x1 - x2) == 1 and y1 == y2) or (abs(y1 - y2) == 1 and x1 == x2)
-
-# Generar opciones de jalar (solo si la pieza rival está adyacente)
-def generate_pull_options(target_pos, puller_pos):
-    tx, ty = target_pos
-    px, py = puller_pos
-    options = []
-    
-    # Verificar si la pieza rival está adyacente
-    for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-        new_x, new_y = tx + dx, ty + dy
-        if 0 <= new_x < ROWS and 0 <= new_y < COLS and (new_x, new_y) != (px, py):
-            # Validar que la casilla esté vacía para mover la pieza del oponente
-            if not any((nx, ny) == (new_x, new_y) for nx, ny, _ in INITIAL_POSITIONS["gold"] + INITIAL_POSITIONS["silver"]):
-                options.append((new_x, new_y))
-    return options
-
-# Verificar trampas para una pieza en una posición
-def check_trap(x, y):
-    if (x, y) in TRAP_POSITIONS:
-        for color, positions in INITIAL_POSITIONS.items():
-            allies_adjacent = any(
-                (ax, ay) in [(x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)]
-                for ax, ay, _ in positions
-            )
-            if not allies_adjacent:
-                return True  # La pieza debe ser eliminada
-    return False
-
-# Eliminar una pieza
-def remove_piece(x, y):
-    for color, positions in INITIAL_POSITIONS.items():
-        for i, (px, py, piece) in enumerate(positions):
-            if (px, py) == (x, y):
-                positions.pop(i)
-                return
+    found = state.board.piece_at(square(*position))
+    if found is None:
+        return None, None
+    color, ptype = found
+    return COLOR_NAMES[color], PIECE_TYPES[ptype]
+
+# Limpiar la selección actual
+def clear_selection():
+    global selected_square, push_mode, push_options, piece_to_push, pull_mode, pull_options, piece_to_pull, valid_moves, piece_moves
+    selected_square = None
+    push_mode = False
+    push_options = []
+    piece_to_push = None
+    pull_mode = False
+    pull_options = []
+    piece_to_pull = None
+    valid_moves = []
+    piece_moves = []
 
 # Manejar clics
 def handle_click(pos):
-    global selected_square, selected_piece, remaining_moves, current_turn, push_mode, push_options, piece_to_push, valid_moves
+    global selected_square, push_mode, push_options, piece_to_push, pull_mode, pull_options, piece_to_pull, valid_moves, piece_moves
 
-    if current_turn == "silver":
+    if state.turn == SILVER:
         return
 
     x, y = pos[1] // TILE_SIZE, pos[0] // TILE_SIZE
-
-    if push_mode:
-        if (x, y) in push_options:
-            # Mover la pieza empujada a la nueva posición
-            move_piece(piece_to_push, (x, y))
-            
-            # La ficha que empuja ocupa la posición de la ficha empujada
-            move_piece(selected_square, piece_to_push)
-            
-            # Verificar trampas para todas las piezas después de un empuje
-            check_traps()
-            
-            push_mode = False
-            remaining_moves -= 1
+    clicked = square(x, y)
+
+    if push_mode or pull_mode:
+        move = None
+        if push_mode and (x, y) in push_options:
+            # La pieza empujada pasa a la casilla elegida y la que empuja ocupa su lugar
+            move = next(m for m in piece_moves if len(m) == 2 and m[0] == (square(*piece_to_push), clicked))
+        elif pull_mode and (x, y) in pull_options:
+            # La pieza que jala pasa a la casilla elegida y la rival ocupa su lugar
+            move = next(m for m in piece_moves if len(m) == 2 and m[0] == (square(*selected_square), clicked) and m[1][0] == square(*piece_to_pull))
+        push_mode = pull_mode = False
+        push_options = []
+        pull_options = []
+        if move:
+            play_move(move)
+            clear_selection()
             end_turn_if_needed()
-        else:
-            push_mode = False
         return
 
     if selected_square is None:
-        for color, positions in INITIAL_POSITIONS.items():
-            if color == current_turn:
-                for px, py, piece in positions:
-                    if (px, py) == (x, y):
-                        selected_square = (x, y)
-                        selected_piece = piece
-                        valid_moves = [
-                            (px + dx, py + dy)
-                            for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]
-                            if 0 <= px + dx < ROWS and 0 <= py + dy < COLS and is_valid_move((px, py), (px + dx, py + dy))
-                        ]
-                        return
+        color, _ = find_piece((x, y))
+        if color == COLOR_NAMES[state.turn]:
+            selected_square = (x, y)
+            # Movimientos legales de la pieza (no hay si está congelada)
+            piece_moves = generate_piece_moves(state.board, clicked, state.remaining_moves)
+            valid_moves = [square_coords(m[0][1]) for m in piece_moves if len(m) == 1]
+            return
     else:
-        target_color, target_piece = find_piece((x, y))
-
-        if target_color and target_color != current_turn:
-            pusher_strength = PIECE_SYMBOLS[selected_piece]
-            target_strength = PIECE_SYMBOLS[target_piece]
-
-            # Verificar si la pieza del oponente está adyacente antes de intentar empujarla
-            if is_adjacent(selected_square, (x, y)) and pusher_strength > target_strength:
-                push_mode = True
-                push_options = generate_push_options((x, y), selected_square)
-                piece_to_push = (x, y)
-                return
-
-        if is_valid_move(selected_square, (x, y)):
-            move_piece(selected_square, (x, y))
-            
-            # Verificar trampas para todas las piezas después de un movimiento normal
-            check_traps()
-
-            remaining_moves -= 1
+        # Empujar o jalar una pieza rival adyacente y más débil. Solo si la
+        # casilla tiene una rival: con la propia pieza m[0][0] serían sus jalones.
+        color, _ = find_piece((x, y))
+        if color is not None and color != COLOR_NAMES[state.turn]:
+            push_options = [square_coords(m[0][1]) for m in piece_moves if len(m) == 2 and m[0][0] == clicked]
+            pull_options = [square_coords(m[0][1]) for m in piece_moves if len(m) == 2 and m[1][0] == clicked]
+        if push_options or pull_options:
+            push_mode = bool(push_options)
+            pull_mode = bool(pull_options)
+            piece_to_push = piece_to_pull = (x, y)
+            return
+
+        move = next((m for m in piece_moves if len(m) == 1 and m[0][1] == clicked), None)
+        if move:
+            # Mover y verificar trampas para todas las piezas
+            play_move(move)
             end_turn_if_needed()
 
-        selected_square = None
-        valid_moves = []
-        
-# Terminar turno si es necesario
+        clear_selection()
+
+# Terminar turno si es necesario: sin pasos o sin movimientos legales para
+# los pasos que quedan (p. ej. solo empujes con un paso)
 def end_turn_if_needed():
-    global remaining_moves, current_turn
-    if remaining_moves == 0:
-        remaining_moves = 4
-        current_turn = "silver"
+    if result is None and (state.remaining_moves == 0 or not state.legal_moves()):
+        state.end_turn()
         handle_opponent_turn()
 
-# Heurística para evaluar el estado del tablero
-def evaluate_board():
-    score = 0
-    for color, positions in INITIAL_POSITIONS.items():
-        for x, y, piece in positions:
-            piece_value = PIECE_SYMBOLS[piece]
-            if color == "gold":
-                score += piece_value
-            else:
-                score -= piece_value
-
-            # Penalizar si la pieza está en una trampa sin aliados adyacentes
-            if (x, y) in TRAP_POSITIONS:
-                allies_adjacent = any(
-                    (ax, ay) in [(x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)]
-                    for ax, ay, _ in positions
-                )
-                if not allies_adjacent:
-                    if color == "gold":
-                        score -= piece_value
-                    else:
-                        score += piece_value
-
-            # Bonificar si la pieza tiene aliados adyacentes
-            allies_adjacent = sum(
-                1 for ax, ay, _ in positions
-                if (ax, ay) in [(x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)]
-            )
-            score += allies_adjacent if color == "gold" else -allies_adjacent
-
-    return score
-
-
-# Algoritmo Minimax con poda alfa-beta
-def minimax(depth, alpha, beta, maximizing_player):
-    if depth == 0 or remaining_moves == 0:
-        return evaluate_board()
-
-    if maximizing_player:
-        max_eval = float('-inf')
-        for x, y, piece in INITIAL_POSITIONS["silver"]:
-            possible_moves = [
-                (x + dx, y + dy)
-                for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]
-                if 0 <= x + dx < ROWS and 0 <= y + dy < COLS
-            ]
-            for move in possible_moves:
-                if is_valid_move((x, y), move):
-                    move_piece((x, y), move)
-                    eval = minimax(depth - 1, alpha, beta, False)
-                    move_piece(move, (x, y))  # Deshacer movimiento
-                    max_eval = max(max_eval, eval)
-                    alpha = max(alpha, eval)
-                    if beta <= alpha:
-                        break
-        return max_eval
-    else:
-        min_eval = float('inf')
-        for x, y, piece in INITIAL_POSITIONS["gold"]:
-            possible_moves = [
-                (x + dx, y + dy)
-                for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]
-                if 0 <= x + dx < ROWS and 0 <= y + dy < COLS
-            ]
-            for move in possible_moves:
-                if is_valid_move((x, y), move):
-                    move_piece((x, y), move)
-                    eval = minimax(depth - 1, alpha, beta, True)
-                    move_piece(move, (x, y))  # Deshacer movimiento
-                    min_eval = min(min_eval, eval)
-                    beta = min(beta, eval)
-                    if beta <= alpha:
-                        break
-        return min_eval
-
-# Obtener el mejor movimiento para la IA usando Minimax
-def get_best_move():
-    best_move = None
-    best_value = float('-inf')
-    for x, y, piece in INITIAL_POSITIONS["silver"]:
-        possible_moves = [
-            (x + dx, y + dy)
-            for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]
-            if 0 <= x + dx < ROWS and 0 <= y + dy < COLS
-        ]
-        for move in possible_moves:
-            if is_valid_move((x, y), move):
-                move_piece((x, y), move)
-                move_value = minimax(3, float('-inf'), float('inf'), False)
-                move_piece(move, (x, y))  # Deshacer movimiento
-                print(f"Evaluando movimiento de {x, y} a {move}: Puntaje {move_value}")  # Imprimir el puntaje del movimiento
-                if move_value > best_value:
-                    best_value = move_value
-                    best_move = ((x, y), move)
-    return best_move
-
-# Manejar el turno del oponente
+# Pasar el turno con END_TURN_KEYS: después de al menos un paso, o sin
+# movimientos legales (todas las piezas congeladas)
+def end_turn_by_player():
+    if state.turn == SILVER or result is not None:
+        return
+    if state.remaining_moves < STEPS_PER_TURN or not state.legal_moves():
+        clear_selection()
+        state.end_turn()
+        handle_opponent_turn()
+
+# Manejar el turno del oponente: si el jugador hizo lo que la IA pensaba de
+# antemano se usa esa búsqueda; si no, la IA empieza a buscar un turno
+# completo en segundo plano. update_opponent_turn lo muestra paso a paso.
 def handle_opponent_turn():
-    global remaining_moves, current_turn
-
-    while remaining_moves > 0:
-        best_move = get_best_move()
-        if best_move:
-            start, end = best_move
-            print(f"IA mueve de {start} a {end} con puntaje {evaluate_board()}")  # Imprimir la decisión de la IA con el puntaje
-            move_piece(start, end)
-            # Verificar si la pieza del oponente cae en una trampa
-            if check_trap(end[0], end[1]):
-                remove_piece(end[0], end[1])
-
-            remaining_moves -= 1
-
-            screen.fill((0, 0, 0))
-            draw_board()
-            draw_pieces()
-            pygame.display.flip()
-            time.sleep(0.5)
-
-        check_traps()
-
-    remaining_moves = 4
-    current_turn = "gold"
-
-
-# Verificar trampas para todas las piezas del tablero
-def check_traps():
-    global INITIAL_POSITIONS
-    for color, positions in INITIAL_POSITIONS.items():
-        to_remove = []
-        for x, y, piece in positions:
-            if (x, y) in TRAP_POSITIONS:
-                allies_adjacent = any(
-                    (ax, ay) in [(x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)]
-                    for ax, ay, _ in positions
-                )
-                if not allies_adjacent:
-                    to_remove.append((x, y, piece))
-
-        for item in to_remove:
-            positions.remove(item)
-
-# Bucle principal
+    global ai_steps
+    ai_steps = None
+    if ai.ponder_hit(state, searcher.time_limit):
+        logger.debug("El jugador hizo el turno previsto")
+    else:
+        ai.start(state)
+
+# Avanzar el turno de la IA en cada cuadro: mostrar el avance de la búsqueda
+# mientras piensa y después aplicar un paso cada STEP_DELAY segundos
+def update_opponent_turn():
+    global ai_steps, next_step_time
+    if state.turn != SILVER:
+        return
+    now = time.perf_counter()
+    if ai_steps is None:
+        finished, best_move = ai.poll()
+        if not finished:
+            depth, nodes = ai.progress()
+            pygame.display.set_caption(f"{CAPTION} - IA pensando: profundidad {depth}, {nodes} nodos")
+            return
+        pygame.display.set_caption(CAPTION)
+        ai_steps = list(best_move or ())
+        next_step_time = now
+    if now < next_step_time:
+        return
+    if ai_steps:
+        step = ai_steps.pop(0)
+        play_move((step,))
+        logger.debug("IA mueve %s con puntaje %s", format_move((step,)), evaluator(state.board))
+        next_step_time = now + STEP_DELAY
+    else:
+        ai_steps = None
+        state.end_turn()
+        # Pensar durante el turno del jugador
+        ai.ponder(state)
+
+# Segundos que el bucle puede esperar eventos sin dibujar: None si no hay
+# nada en curso (turno del jugador), o hasta el próximo paso de la IA, la
+# próxima actualización del avance o el corte de lo pensado
+def wait_time():
+    if state.turn != SILVER:
+        return None
+    if ai_steps is not None:
+        return max(0.0, next_step_time - time.perf_counter())
+    timeout = PROGRESS_INTERVAL
+    if ai.ponder_deadline is not None:
+        timeout = min(timeout, max(0.0, ai.ponder_deadline - time.perf_counter()))
+    return timeout
+
+# Bucle principal: espera eventos (clics, cierre o aviso de la IA) en lugar de
+# dibujar sin parar, y limita los cuadros por segundo con el reloj
+clock = pygame.time.Clock()
+draw()
+logger.debug("Primer cuadro a los %.3f s de empezar", time.perf_counter() - start_time)
 running = True
 while running:
-    for event in pygame.event.get():
+    timeout = wait_time()
+    if timeout is None:
+        events = [pygame.event.wait()]
+    else:
+        events = [pygame.event.wait(max(1, int(timeout * 1000)))]
+    events += pygame.event.get()
+    for event in events:
         if event.type == pygame.QUIT:
             running = False
+        if event.type == pygame.VIDEOEXPOSE:
+            # La ventana se tapó o se restauró: redibujar todo
+            drawn_views = None
         if event.type == pygame.MOUSEBUTTONDOWN:
             pos = pygame.mouse.get_pos()
             handle_click(pos)
-    
-    # Verificar si hay un conejo en una posicion final
-    for x, y, piece in INITIAL_POSITIONS["gold"]:
-        if x == 7 and piece == "R":
-            print("¡El jugador Gold ha ganado!")
-            running = False
-            break
-    
-    for x, y, piece in INITIAL_POSITIONS["silver"]:
-        if x == 0 and piece == "R":
-            print("¡El jugador Silver ha ganado!")
-            running = False
-            break
+        if event.type == pygame.KEYDOWN and event.key in END_TURN_KEYS:
+            end_turn_by_player()
+
+    update_opponent_turn()
 
-    
+    # Verificar si hay un conejo en una posicion final (máscaras de bits, sin recorrer piezas)
+    if result == GOLD:
+        print("¡El jugador Gold ha ganado!")
+        running = False
 
-    screen.fill((0, 0, 0))  # Limpiar pantalla
-    draw_board()
-    draw_pieces()
+    if result == SILVER:
+        print("¡El jugador Silver ha ganado!")
+        running = False
 
-    pygame.display.flip()
+    draw()
+    clock.tick(FRAME_RATE)
 
-pygame.quit()
\ No newline at end of file
+ai.stop()
+pygame.quit()
@@ -0,0 +1,23 @@
+from .board import (
+    Board, GOLD, SILVER, COLOR_NAMES, COLOR_INDEX, PIECE_TYPES, PIECE_INDEX,
+    PIECE_VALUES, RABBIT, CAT, DOG, HORSE, CAMEL, ELEPHANT, EMPTY, TRAP_SQUARES,
+    TRAP_MASK, ROW_MASKS, NEIGHBORS, NEIGHBOR_MASKS, ZOBRIST_PIECES, ZOBRIST_SIDE,
+    ZOBRIST_STEPS, square, square_coords, iter_bits,
+)
+from .tt import TranspositionTable, SharedTranspositionTable, EXACT, LOWER, UPPER
+from .movegen import (
+    STEPS_PER_TURN, generate_moves, generate_piece_moves, generate_turns,
+    iter_turns, is_frozen, is_trapped, make_move, unmake_move, captured_pieces,
+)
+from .rules import (
+    GameState, generate_random_positions, generate_random_setup, is_adjacent,
+    check_traps, winner,
+)
+from .evaluation import (
+    PIECE_SYMBOLS, FEATURE_NAMES, EVALUATORS, Evaluator, evaluation_terms,
+    register_evaluator, get_evaluator, load_weights, save_weights, evaluate_board,
+    evaluate_board_column, evaluate_board_full, evaluate_board_column_full,
+)
+from .goal import goal_distance, goal_threat
+from .ordering import MoveOrdering, capture_value
+from .search import Searcher, SearchStats, SearchTimeout, WIN_SCORE, log_iteration
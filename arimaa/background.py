@@ -0,0 +1,148 @@
+# Búsqueda en un hilo aparte, para que la interfaz siga dibujando y atendiendo
+# eventos mientras la IA piensa. El hilo trabaja sobre una copia del estado y
+# deja el turno elegido en una cola que la interfaz revisa en cada cuadro.
+#
+# Mientras juega el rival, ponder() supone su respuesta más probable (la de la
+# variante principal) y busca de antemano la posición que resulta. Si el rival
+# juega eso, ponder_hit() convierte esa búsqueda en la del turno y la respuesta
+# llega casi enseguida; si no, la tabla de transposición queda cargada igual.
+import queue
+import threading
+import time
+
+from .search import MAX_DEPTH, Searcher
+
+PREDICTION_TT_SIZE = 1 << 12  # Tabla del buscador aparte que predice la respuesta
+
+
+class BackgroundSearch:
+    # on_result: función sin argumentos que el hilo llama al dejar un turno en
+    # la cola, por ejemplo para despertar un bucle de eventos que está esperando
+    def __init__(self, searcher, on_result=None):
+        self.searcher = searcher
+        self.on_result = on_result
+        self.results = queue.Queue()  # (pedido, turno) de cada búsqueda terminada
+        self.thread = None
+        self.cancelled = threading.Event()  # Lo marca stop() para el hilo en curso
+        self.request = 0  # Número de la última búsqueda pedida
+        self.ponder_move = None  # Turno que se espera del rival
+        self.ponder_key = None  # (hash, color) de la posición que se piensa
+        self.ponder_start = 0.0
+        self.ponder_deadline = None  # Cuándo cortar lo pensado tras ponder_hit
+        self.predictor = None  # Buscador aparte que predice la respuesta del rival
+
+    def _launch(self, target, *args):
+        self.stop()
+        self.request += 1
+        self.searcher.stopped = False
+        self.cancelled = threading.Event()
+        self.ponder_move = None
+        self.ponder_key = None
+        self.ponder_deadline = None
+        self.thread = threading.Thread(
+            target=target, args=(self.request, self.cancelled) + args, daemon=True,
+        )
+        self.thread.start()
+        return self.request
+
+    # Empezar a buscar el turno del color que mueve en `state`, cortando la
+    # búsqueda anterior si sigue en curso. Devuelve el número del pedido.
+    def start(self, state, time_limit=None, depth=None):
+        return self._launch(self._run, state.copy(), time_limit, depth)
+
+    def _run(self, request, cancelled, state, time_limit, depth):
+        self._deliver(request, self.searcher.get_best_move(state, time_limit, depth))
+
+    def _deliver(self, request, move):
+        self.results.put((request, move))
+        if self.on_result is not None:
+            self.on_result()
+
+    # Pensar durante el turno del color que mueve en `state`. `predicted` es
+    # el turno que se espera; por omisión el de la variante principal que dejó
+    # la última búsqueda o, si no hay, el de una búsqueda de profundidad 1 con
+    # un buscador aparte, para no mezclar los asesinos y la historia del
+    # compartido; stop() también lo corta.
+    # La búsqueda no tiene límite hasta que llegue ponder_hit() o stop().
+    def ponder(self, state, predicted=None):
+        self.ponder_start = time.perf_counter()
+        return self._launch(self._ponder, state.copy(), predicted)
+
+    def _ponder(self, request, cancelled, state, predicted):
+        searcher = self.searcher
+        if not predicted:
+            variation = searcher.principal_variation(state, 1)
+            if variation:
+                predicted = variation[0]
+            else:
+                predictor = self.predictor = Searcher(
+                    evaluate=searcher.evaluate, evaluate_color=searcher.evaluate_color,
+                    tt_size=PREDICTION_TT_SIZE,
+                )
+                # stop() marca cancelled antes de cortar el predictor: si ya
+                # está marcado, puede que no lo haya visto
+                if cancelled.is_set():
+                    return
+                predicted = predictor.get_best_move(state, depth=1)
+        if cancelled.is_set() or not predicted:
+            return
+        self.ponder_move = predicted
+        state.apply_move(predicted)
+        state.end_turn()
+        self.ponder_key = (state.board.hash, state.turn)
+        searcher.transposition_table.new_search()
+        if searcher.ordering is not None:
+            searcher.ordering.new_search()
+        best_move = None
+        for stats in searcher.iter_search(state, float("inf"), MAX_DEPTH):
+            best_move = stats.move
+        if best_move is None and not cancelled.is_set():
+            # Se cortó antes de terminar la primera iteración
+            best_move = searcher.get_best_move(state, depth=1)
+        self._deliver(request, best_move)
+
+    # Comprobar si el rival jugó lo previsto. Si la posición de `state` es la
+    # que se está pensando, esa búsqueda pasa a ser la del turno: se corta
+    # `time_limit` segundos después de haber empezado a pensar y su turno llega
+    # por poll(). Si no coincide devuelve False y hay que llamar a start().
+    def ponder_hit(self, state, time_limit):
+        if self.ponder_key is None or self.ponder_key != (state.board.hash, state.turn):
+            return False
+        self.ponder_deadline = self.ponder_start + time_limit
+        return True
+
+    def running(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    # Cortar la búsqueda en curso y esperar a que el hilo termine; su resultado
+    # se descarta
+    def stop(self):
+        if self.running():
+            self.cancelled.set()
+            self.searcher.stop()
+            if self.predictor is not None:
+                self.predictor.stop()
+            self.thread.join()
+            self.request += 1
+        self.thread = None
+        self.predictor = None
+
+    # Revisar la cola sin esperar: (True, turno) si terminó la última búsqueda
+    # pedida (el turno es None si no hay movimientos) y (False, None) si no
+    def poll(self):
+        if self.ponder_deadline is not None and time.perf_counter() >= self.ponder_deadline:
+            # Se acabó el tiempo de lo pensado: la iteración en curso se corta
+            # y el hilo entrega el turno de la última completa
+            self.ponder_deadline = None
+            self.searcher.stop()
+        while True:
+            try:
+                request, move = self.results.get_nowait()
+            except queue.Empty:
+                return False, None
+            if request == self.request:
+                return True, move
+
+    # Profundidad en curso y nodos visitados hasta ahora, para mostrar el avance
+    def progress(self):
+        return self.searcher.stats.depth, self.searcher.nodes
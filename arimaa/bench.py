@@ -0,0 +1,441 @@
+# Benchmarks del motor sobre un conjunto fijo de posiciones con semilla.
+# Uso: python -m arimaa.bench [--quick] [--output resultados.json]
+# El resultado es JSON para poder comparar entre commits.
+# Con --verify, en lugar de medir se comprueban el generador de movimientos y
+# las heurísticas rápidas contra versiones de referencia (ver verify).
+import argparse
+import json
+import platform
+import random
+import time
+
+from . import features
+from .board import EMPTY, GOLD, NEIGHBORS, RABBIT, ROWS, SILVER, TRAP_SQUARES, Board, square_coords
+from .evaluation import (
+    EVALUATORS as REGISTERED_EVALUATORS, evaluate_board, evaluate_board_column,
+    evaluate_board_full, evaluate_board_column_full, evaluation_terms,
+)
+from .goal import goal_distance
+from .movegen import STEPS_PER_TURN, generate_moves, generate_turns, make_move, unmake_move
+from .rules import GameState, winner
+from .search import Searcher
+
+# Posiciones del conjunto: (nombre, semilla, turnos jugados al azar desde la salida)
+BENCH_POSITIONS = [
+    ("opening-1", 1, 0),
+    ("opening-2", 2, 0),
+    ("opening-3", 3, 0),
+    ("early-1", 11, 4),
+    ("early-2", 12, 4),
+    ("middle-1", 21, 12),
+    ("middle-2", 22, 12),
+    ("middle-3", 23, 12),
+]
+
+EVALUATORS = [
+    ("evaluate_board", evaluate_board, GOLD),
+    ("evaluate_board_column", evaluate_board_column, SILVER),
+    ("evaluate_board_full", evaluate_board_full, GOLD),
+    ("evaluate_board_column_full", evaluate_board_column_full, SILVER),
+] + [(f"registry:{name}", evaluator, evaluator.color) for name, evaluator in REGISTERED_EVALUATORS.items()]
+
+
+# Construir una posición del conjunto: salida con semilla y luego `plies`
+# turnos elegidos al azar con el mismo generador
+def bench_position(seed, plies):
+    rng = random.Random(seed)
+    state = GameState.new_game(seed)
+    for _ in range(plies):
+        if state.winner() is not None:
+            break
+        turns = generate_turns(state.board, state.turn)
+        if not turns:
+            break
+        state.apply_move(rng.choice(turns))
+        state.end_turn()
+    return state
+
+
+def bench_positions():
+    return [(name, bench_position(seed, plies)) for name, seed, plies in BENCH_POSITIONS]
+
+
+# Contar las secuencias de pasos de largo `depth`. Cada color juega
+# STEPS_PER_TURN pasos antes de pasar el turno; empujes y jalones cuentan 2.
+def perft(board, color, depth, steps_left=STEPS_PER_TURN):
+    if depth == 0:
+        return 1
+    nodes = 0
+    for move in generate_moves(board, color, min(steps_left, depth)):
+        undo = make_move(board, move)
+        remaining = steps_left - len(move)
+        if remaining:
+            nodes += perft(board, color, depth - len(move), remaining)
+        else:
+            nodes += perft(board, 1 - color, depth - len(move))
+        unmake_move(board, undo)
+    return nodes
+
+
+def bench_perft(positions, max_depth):
+    results = []
+    for name, state in positions:
+        for depth in range(1, max_depth + 1):
+            start = time.perf_counter()
+            nodes = perft(state.board, state.turn, depth, state.remaining_moves)
+            elapsed = time.perf_counter() - start
+            results.append({
+                "position": name,
+                "depth": depth,
+                "nodes": nodes,
+                "seconds": elapsed,
+                "nodes_per_second": nodes / elapsed if elapsed else 0.0,
+            })
+        start = time.perf_counter()
+        turns = len(generate_turns(state.board, state.turn, state.remaining_moves))
+        results.append({
+            "position": name,
+            "unique_turns": turns,
+            "seconds": time.perf_counter() - start,
+        })
+    return results
+
+
+# Búsqueda a profundidad fija (en turnos) con una tabla nueva por posición
+def bench_search(positions, depth, **searcher_options):
+    results = []
+    for name, state in positions:
+        searcher = Searcher(depth=depth, **searcher_options)
+        state = state.copy()
+        start = time.perf_counter()
+        move = searcher.get_best_move(state)
+        elapsed = time.perf_counter() - start
+        results.append({
+            "position": name,
+            "depth": depth,
+            "nodes": searcher.nodes,
+            "seconds": elapsed,
+            "nodes_per_second": searcher.nodes / elapsed if elapsed else 0.0,
+            "time_to_depth": {str(d): seconds for d, seconds in searcher.depth_times},
+            "iterations": [stats.as_dict() for stats in searcher.iterations],
+            "move": [list(step) for step in move] if move else None,
+        })
+    return results
+
+
+# Variantes de la búsqueda que se comparan a igual profundidad:
+# (nombre, opciones de Searcher). La primera es la referencia.
+ORDERING_VARIANTS = [
+    ("generator", {"move_ordering": False}),
+    ("ordered", {}),
+]
+SEARCH_MODE_VARIANTS = [
+    ("alphabeta", {"pvs": False, "aspiration_window": None}),
+    ("pvs", {"aspiration_window": None}),
+    ("pvs_aspiration", {}),
+]
+
+
+# Nodos y tiempo de cada variante a la misma profundidad, con la proporción de
+# nodos respecto de la primera
+def bench_variants(positions, depth, variants):
+    results = []
+    for name, state in positions:
+        row = {"position": name, "depth": depth}
+        for label, options in variants:
+            searcher = Searcher(depth=depth, **options)
+            start = time.perf_counter()
+            searcher.get_best_move(state.copy())
+            row[label] = {
+                "nodes": searcher.nodes,
+                "seconds": time.perf_counter() - start,
+                "score": searcher.iterations[-1].score if searcher.iterations else None,
+            }
+        reference = row[variants[0][0]]["nodes"]
+        row["node_ratio"] = {
+            label: row[label]["nodes"] / reference if reference else None
+            for label, _ in variants[1:]
+        }
+        results.append(row)
+    return results
+
+
+# Evaluaciones por segundo de cada heurística sobre las posiciones del conjunto.
+# Con NumPy se mide también la evaluación por lotes de todas las repeticiones.
+def bench_evaluation(positions, repeat):
+    boards = [state.board for _, state in positions]
+    results = []
+    for name, evaluate, _ in EVALUATORS:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for board in boards:
+                evaluate(board)
+        elapsed = time.perf_counter() - start
+        evals = repeat * len(boards)
+        results.append({
+            "evaluator": name,
+            "evals": evals,
+            "seconds": elapsed,
+            "evals_per_second": evals / elapsed if elapsed else 0.0,
+        })
+    if features.available():
+        batch = [board.squares for board in boards] * repeat
+        for name in REGISTERED_EVALUATORS:
+            start = time.perf_counter()
+            features.evaluate_batch(batch, name)
+            elapsed = time.perf_counter() - start
+            results.append({
+                "evaluator": f"batch:{name}",
+                "evals": len(batch),
+                "seconds": elapsed,
+                "evals_per_second": len(batch) / elapsed if elapsed else 0.0,
+            })
+    return results
+
+
+# Generador de movimientos de referencia, casilla por casilla y sin máscaras:
+# el mismo conjunto de movimientos que generate_moves, en otro orden
+def reference_moves(board, color, steps_left=STEPS_PER_TURN):
+    squares = board.squares
+    moves = []
+    if steps_left <= 0:
+        return moves
+    for sq, code in enumerate(squares):
+        if code == EMPTY or code // 6 != color:
+            continue
+        strength = code % 6
+        neighbors = NEIGHBORS[sq]
+        friends = [n for n in neighbors if squares[n] != EMPTY and squares[n] // 6 == color]
+        enemies = [n for n in neighbors if squares[n] != EMPTY and squares[n] // 6 != color]
+        if not friends and any(squares[n] % 6 > strength for n in enemies):
+            continue
+        row = square_coords(sq)[0]
+        for n in neighbors:
+            if squares[n] != EMPTY:
+                continue
+            # Los conejos no retroceden: oro avanza hacia la fila 7, plata hacia la 0
+            if strength == 0 and (square_coords(n)[0] - row) * (1 if color == GOLD else -1) < 0:
+                continue
+            moves.append(((sq, n),))
+        if steps_left < 2:
+            continue
+        for victim in enemies:
+            if squares[victim] % 6 >= strength:
+                continue
+            for n in NEIGHBORS[victim]:
+                if squares[n] == EMPTY:
+                    moves.append(((victim, n), (sq, victim)))
+            for n in neighbors:
+                if squares[n] == EMPTY:
+                    moves.append(((sq, n), (victim, sq)))
+    return moves
+
+
+# Distancia a la meta de referencia para goal_distance: búsqueda en anchura
+# de los pasos de cada conejo por separado, casilla por casilla, con el resto
+# de las piezas quietas y las mismas reglas de congelamiento y trampas
+def reference_goal_distance(board, color, max_steps=STEPS_PER_TURN):
+    squares = board.squares
+    rabbit = color * 6 + RABBIT
+    goal_row = ROWS - 1 if color == GOLD else 0
+    forward = 1 if color == GOLD else -1
+    best = None
+    for start, code in enumerate(squares):
+        if code != rabbit:
+            continue
+        if square_coords(start)[0] == goal_row:
+            return 0
+
+        # La casilla de salida queda vacía mientras el conejo se mueve
+        def has_friend(sq):
+            return any(n != start and squares[n] != EMPTY and squares[n] // 6 == color
+                       for n in NEIGHBORS[sq])
+
+        def frozen(sq):
+            return not has_friend(sq) and any(
+                squares[n] != EMPTY and squares[n] // 6 != color and squares[n] % 6 > RABBIT
+                for n in NEIGHBORS[sq] if n != start
+            )
+
+        limit = min(max_steps, STEPS_PER_TURN) if best is None else best - 1
+        frontier = [start]
+        reached = {start}
+        for steps in range(1, limit + 1):
+            following = []
+            for sq in frontier:
+                if frozen(sq):
+                    continue
+                row = square_coords(sq)[0]
+                for n in NEIGHBORS[sq]:
+                    if n in reached or (squares[n] != EMPTY and n != start):
+                        continue
+                    if (square_coords(n)[0] - row) * forward < 0:
+                        continue
+                    if n in TRAP_SQUARES and not has_friend(n):
+                        continue  # Cae en la trampa
+                    reached.add(n)
+                    following.append(n)
+            if any(square_coords(sq)[0] == goal_row for sq in following):
+                best = steps
+                break
+            frontier = following
+    return best
+
+
+# Todo lo que el tablero mantiene en cada paso
+def board_state(board):
+    return (
+        board.squares[:], board.bitboards[:], board.occupied[:], board.hash,
+        board.material[:], board.friendly_pairs[:], board.column_material[:],
+    )
+
+
+# Referencias de las heurísticas rápidas y de las del registro con el mismo nombre
+VERIFIED_EVALUATORS = [
+    ("evaluate_board", evaluate_board, evaluate_board_full),
+    ("evaluate_board_column", evaluate_board_column, evaluate_board_column_full),
+    ("registry:board", REGISTERED_EVALUATORS["board"], evaluate_board_full),
+    ("registry:column", REGISTERED_EVALUATORS["column"], evaluate_board_column_full),
+]
+
+
+# Comprobar una posición; agrega a `failures` lo que no coincide
+def verify_position(board, color, steps_left, failures):
+    where = f"{board!r} color {color} pasos {steps_left}"
+    # Términos incrementales contra el tablero armado de cero
+    if board_state(board) != board_state(Board.from_squares(board.squares)):
+        failures.append(f"términos incrementales distintos en {where}")
+    for name, evaluate, reference in VERIFIED_EVALUATORS:
+        if evaluate(board) != reference(board):
+            failures.append(f"{name}: {evaluate(board)} != {reference(board)} en {where}")
+    moves = generate_moves(board, color, steps_left)
+    if sorted(moves) != sorted(reference_moves(board, color, steps_left)):
+        failures.append(f"generate_moves distinto de la referencia en {where}")
+    for goal_color in (GOLD, SILVER):
+        distance = goal_distance(board, goal_color, steps_left)
+        reference = reference_goal_distance(board, goal_color, steps_left)
+        if distance != reference:
+            failures.append(f"goal_distance de {goal_color}: {distance} != {reference} en {where}")
+    # Aplicar y deshacer cada movimiento deja el tablero exactamente igual
+    before = board_state(board)
+    for move in moves:
+        unmake_move(board, make_move(board, move))
+        if board_state(board) != before:
+            failures.append(f"make/unmake de {move} no vuelve al inicio en {where}")
+            break
+    return moves
+
+
+BATCH_TOLERANCE = 1e-6  # Diferencia admitida entre NumPy y las heurísticas escalares
+
+
+# Comprobar el camino de NumPy sobre las casillas de `positions`: los planos y
+# el camino rápido dan los términos de evaluation_terms, y evaluate_batch los
+# puntajes de cada heurística del registro
+def verify_batch(positions, failures):
+    boards = [Board.from_squares(squares) for squares in positions]
+    checks = [
+        ("board_planes/planes_features", features.planes_features(features.board_planes(positions)),
+         [evaluation_terms(board, GOLD) for board in boards]),
+        ("position_features", features.position_features(positions),
+         [evaluation_terms(board, GOLD) for board in boards]),
+    ] + [
+        (f"evaluate_batch:{name}", features.evaluate_batch(positions, name),
+         [evaluator(board) for board in boards])
+        for name, evaluator in REGISTERED_EVALUATORS.items()
+    ]
+    for name, values, expected in checks:
+        for board, value, reference in zip(boards, values.tolist(), expected):
+            if isinstance(value, float):
+                value, reference = [value], [reference]
+            if any(abs(a - b) > BATCH_TOLERANCE for a, b in zip(value, reference)):
+                failures.append(f"{name}: {value} != {list(reference)} en {board!r}")
+                break
+
+
+# Recorrer `games` secuencias de `plies` pasos al azar desde salidas con
+# semilla y comprobar cada posición: el generador contra reference_moves,
+# make/unmake_move, los términos incrementales del tablero, goal_distance
+# contra reference_goal_distance y las heurísticas rápidas contra
+# evaluate_board_full y evaluate_board_column_full. Con NumPy, las mismas
+# posiciones pasan además por verify_batch.
+def verify(games=50, plies=200, seed=0):
+    failures = []
+    positions = 0
+    batch = []
+    for game in range(games):
+        rng = random.Random(seed + game)
+        board = GameState.new_game(seed + game).board
+        color = GOLD
+        steps_left = STEPS_PER_TURN
+        for _ in range(plies):
+            positions += 1
+            batch.append(board.squares[:])
+            moves = verify_position(board, color, steps_left, failures)
+            # También con un solo paso, donde no hay empujes ni jalones
+            verify_position(board, color, 1, failures)
+            if not moves or winner(board) is not None or len(failures) >= 10:
+                break
+            move = rng.choice(moves)
+            make_move(board, move)
+            steps_left -= len(move)
+            # Pasar el turno antes de usar todos los pasos, a veces
+            if steps_left == 0 or rng.random() < 0.1:
+                color = 1 - color
+                steps_left = STEPS_PER_TURN
+        if len(failures) >= 10:
+            break
+    batch_verified = features.available()
+    if batch_verified:
+        verify_batch(batch, failures)
+    return {
+        "games": games, "plies": plies, "seed": seed, "positions": positions,
+        "batch_verified": batch_verified, "failures": failures,
+    }
+
+
+def run_benchmarks(quick=False):
+    positions = bench_positions()
+    return {
+        "python": platform.python_version(),
+        "quick": quick,
+        "perft": bench_perft(positions, 3 if quick else 4),
+        "search": bench_search(positions, 1 if quick else 2),
+        "move_ordering": bench_variants(positions[:2] if quick else positions, 2, ORDERING_VARIANTS),
+        # La ventana de aspiración recién se usa desde la profundidad 3 (toma el
+        # puntaje de la iteración de la misma paridad), así que va a 3; en las
+        # salidas el puntaje es 0 y casi no cambia nada, el efecto se ve en las
+        # posiciones "early" (las "middle" a profundidad 3 tardan demasiado)
+        "search_modes": bench_variants(positions[:2] if quick else positions[:5], 3, SEARCH_MODE_VARIANTS),
+        "evaluators": bench_variants(
+            positions[:2] if quick else positions, 2,
+            [(name, {"evaluate": evaluator}) for name, evaluator in REGISTERED_EVALUATORS.items()],
+        ),
+        "evaluation": bench_evaluation(positions, 200 if quick else 5000),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks del motor de Arimaa")
+    parser.add_argument("--quick", action="store_true", help="profundidades y repeticiones reducidas")
+    parser.add_argument("--output", help="archivo JSON de salida (por omisión, la salida estándar)")
+    parser.add_argument("--verify", action="store_true",
+                        help="comprobar el generador y las heurísticas en lugar de medir")
+    parser.add_argument("--games", type=int, default=50, help="secuencias de pasos de --verify")
+    parser.add_argument("--plies", type=int, default=200, help="pasos por secuencia de --verify")
+    parser.add_argument("--seed", type=int, default=0, help="semilla de la primera secuencia de --verify")
+    args = parser.parse_args(argv)
+
+    result = verify(args.games, args.plies, args.seed) if args.verify else run_benchmarks(args.quick)
+    report = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report + "\n")
+    else:
+        print(report)
+    if args.verify and result["failures"]:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
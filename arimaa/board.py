@@ -0,0 +1,205 @@
+# Representación del tablero con bitboards: una máscara de 64 bits por color
+# y por tipo de pieza, más un arreglo de 64 casillas para consultas O(1).
+import random
+
+ROWS, COLS = 8, 8
+
+# Colores
+GOLD, SILVER = 0, 1
+COLOR_NAMES = ("gold", "silver")
+COLOR_INDEX = {"gold": GOLD, "silver": SILVER}
+
+# Tipos de pieza ordenados por fuerza (Conejo el más débil, Elefante el más fuerte)
+PIECE_TYPES = ("R", "G", "D", "H", "C", "E")
+PIECE_INDEX = {piece: i for i, piece in enumerate(PIECE_TYPES)}
+RABBIT, CAT, DOG, HORSE, CAMEL, ELEPHANT = range(6)
+
+# Valor por tipo de pieza, en el orden de PIECE_TYPES
+PIECE_VALUES = (1, 2, 3, 4, 5, 6)
+
+EMPTY = -1
+FULL_MASK = (1 << (ROWS * COLS)) - 1
+
+
+# Convertir coordenadas (fila, columna) a índice de casilla y viceversa
+def square(x, y):
+    return x * COLS + y
+
+
+def square_coords(sq):
+    return divmod(sq, COLS)
+
+
+# Recorrer los bits encendidos de una máscara
+def iter_bits(mask):
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+# Trampas en el tablero
+TRAP_SQUARES = tuple(square(x, y) for x, y in [(2, 2), (2, 5), (5, 2), (5, 5)])
+TRAP_MASK = 0
+for _sq in TRAP_SQUARES:
+    TRAP_MASK |= 1 << _sq
+
+# Máscaras por fila
+ROW_MASKS = [((1 << COLS) - 1) << (x * COLS) for x in range(ROWS)]
+
+# Casillas de las columnas 0 y 1 (bonificación de la heurística por columnas)
+COLUMN_BONUS_MASK = 0
+for _x in range(ROWS):
+    COLUMN_BONUS_MASK |= 0b11 << (_x * COLS)
+
+# Vecinos ortogonales precalculados por casilla
+NEIGHBORS = []
+NEIGHBOR_MASKS = []
+for _sq in range(ROWS * COLS):
+    _x, _y = square_coords(_sq)
+    _adjacent = tuple(
+        square(_x + dx, _y + dy)
+        for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]
+        if 0 <= _x + dx < ROWS and 0 <= _y + dy < COLS
+    )
+    NEIGHBORS.append(_adjacent)
+    _mask = 0
+    for _n in _adjacent:
+        _mask |= 1 << _n
+    NEIGHBOR_MASKS.append(_mask)
+NEIGHBORS = tuple(NEIGHBORS)
+NEIGHBOR_MASKS = tuple(NEIGHBOR_MASKS)
+
+# Claves de Zobrist, indexadas por código de pieza * 64 + casilla.
+# La semilla es fija para que el mismo tablero tenga siempre el mismo hash.
+_zobrist_random = random.Random(0x41524D41)
+ZOBRIST_PIECES = tuple(_zobrist_random.getrandbits(64) for _ in range(12 * ROWS * COLS))
+ZOBRIST_SIDE = _zobrist_random.getrandbits(64)  # Se combina cuando mueve plata
+# Se combinan en una raíz a mitad de turno, por pasos que quedan (0 a 3)
+ZOBRIST_STEPS = tuple(_zobrist_random.getrandbits(64) for _ in range(4))
+
+
+class Board:
+    __slots__ = ("bitboards", "occupied", "squares", "hash",
+                 "material", "friendly_pairs", "column_material")
+
+    def __init__(self):
+        self.bitboards = [0] * 12  # Una máscara por (color, tipo)
+        self.occupied = [0, 0]  # Ocupación por color
+        self.squares = [EMPTY] * (ROWS * COLS)  # Código de pieza por casilla
+        self.hash = 0  # Clave de Zobrist de la colocación de piezas
+        # Términos de evaluación mantenidos en cada paso, por color
+        self.material = [0, 0]  # Suma de valores de las piezas
+        self.friendly_pairs = [0, 0]  # Pares de piezas aliadas adyacentes
+        self.column_material = [0, 0]  # Valor de las piezas en las columnas 0 y 1
+
+    # Construir el tablero a partir de listas {"gold": [(x, y, "E"), ...], ...}
+    @classmethod
+    def from_positions(cls, positions):
+        board = cls()
+        for color_name, pieces in positions.items():
+            color = COLOR_INDEX[color_name]
+            for x, y, piece in pieces:
+                board.put(square(x, y), color, PIECE_INDEX[piece])
+        return board
+
+    # Construir el tablero a partir del arreglo de códigos por casilla
+    @classmethod
+    def from_squares(cls, squares):
+        board = cls()
+        for sq, code in enumerate(squares):
+            if code != EMPTY:
+                board.put(sq, code // 6, code % 6)
+        return board
+
+    def copy(self):
+        board = Board.__new__(Board)
+        board.bitboards = self.bitboards[:]
+        board.occupied = self.occupied[:]
+        board.squares = self.squares[:]
+        board.hash = self.hash
+        board.material = self.material[:]
+        board.friendly_pairs = self.friendly_pairs[:]
+        board.column_material = self.column_material[:]
+        return board
+
+    # Colocar una pieza en una casilla vacía
+    def put(self, sq, color, ptype):
+        bit = 1 << sq
+        code = color * 6 + ptype
+        self.friendly_pairs[color] += (NEIGHBOR_MASKS[sq] & self.occupied[color]).bit_count()
+        self.material[color] += PIECE_VALUES[ptype]
+        if bit & COLUMN_BONUS_MASK:
+            self.column_material[color] += PIECE_VALUES[ptype]
+        self.bitboards[code] |= bit
+        self.occupied[color] |= bit
+        self.squares[sq] = code
+        self.hash ^= ZOBRIST_PIECES[code * 64 + sq]
+
+    # Quitar la pieza de una casilla y devolver su código
+    def remove(self, sq):
+        code = self.squares[sq]
+        color = code // 6
+        bit = 1 << sq
+        self.bitboards[code] &= ~bit
+        self.occupied[color] &= ~bit
+        self.squares[sq] = EMPTY
+        self.hash ^= ZOBRIST_PIECES[code * 64 + sq]
+        self.friendly_pairs[color] -= (NEIGHBOR_MASKS[sq] & self.occupied[color]).bit_count()
+        self.material[color] -= PIECE_VALUES[code % 6]
+        if bit & COLUMN_BONUS_MASK:
+            self.column_material[color] -= PIECE_VALUES[code % 6]
+        return code
+
+    # Mover una pieza de una casilla a otra vacía
+    def move(self, start, end):
+        code = self.squares[start]
+        color = code // 6
+        start_bit = 1 << start
+        end_bit = 1 << end
+        self.bitboards[code] ^= start_bit | end_bit
+        friends = self.occupied[color] ^ start_bit
+        self.occupied[color] = friends | end_bit
+        self.squares[start] = EMPTY
+        self.squares[end] = code
+        self.hash ^= ZOBRIST_PIECES[code * 64 + start] ^ ZOBRIST_PIECES[code * 64 + end]
+        # Actualizar solo los términos que dependen de las dos casillas
+        self.friendly_pairs[color] += (
+            (NEIGHBOR_MASKS[end] & friends).bit_count()
+            - (NEIGHBOR_MASKS[start] & friends).bit_count()
+        )
+        end_in_columns = end % COLS <= 1
+        if (start % COLS <= 1) != end_in_columns:
+            value = PIECE_VALUES[code % 6]
+            self.column_material[color] += value if end_in_columns else -value
+        return code
+
+    # Consultas
+    def piece_at(self, sq):
+        code = self.squares[sq]
+        if code == EMPTY:
+            return None
+        return code // 6, code % 6
+
+    def squares_of(self, color):
+        return iter_bits(self.occupied[color])
+
+    def pieces_of(self, color, ptype):
+        return self.bitboards[color * 6 + ptype]
+
+    def __eq__(self, other):
+        return isinstance(other, Board) and self.squares == other.squares
+
+    def __repr__(self):
+        rows = []
+        for x in range(ROWS):
+            row = ""
+            for y in range(COLS):
+                code = self.squares[square(x, y)]
+                if code == EMPTY:
+                    row += "x" if square(x, y) in TRAP_SQUARES else "."
+                else:
+                    letter = PIECE_TYPES[code % 6]
+                    row += letter if code // 6 == GOLD else letter.lower()
+            rows.append(row)
+        return "\n".join(rows)
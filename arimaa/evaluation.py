@@ -0,0 +1,228 @@
+# Heurísticas para evaluar el estado del tablero.
+# Todas combinan los mismos términos (FEATURE_NAMES), que el tablero mantiene
+# en cada paso; una heurística es un vector de pesos sobre ellos y el color al
+# que favorecen los puntajes positivos. El registro EVALUATORS las reúne por
+# nombre para elegirlas sin cambiar el código del motor ni de la interfaz.
+# Los pesos ajustados (ver arimaa.tuning) se guardan en un archivo JSON que
+# load_weights agrega al registro al arrancar.
+import json
+import os
+
+from .board import (
+    GOLD, SILVER, COLS, COLOR_INDEX, COLOR_NAMES, EMPTY, PIECE_VALUES, TRAP_SQUARES,
+    NEIGHBOR_MASKS,
+)
+
+PIECE_SYMBOLS = {
+    "E": 6,  # Elefante
+    "C": 5,  # Camello
+    "H": 4,  # Caballo
+    "D": 3,  # Perro
+    "G": 2,  # Gato
+    "R": 1   # Conejo
+}
+
+
+# Término de trampas: valor de las piezas en trampas sin aliados adyacentes,
+# positivo para las de plata y negativo para las de oro. Solo mira 4 casillas.
+def _trap_term(board):
+    squares = board.squares
+    occupied = board.occupied
+    term = 0
+    for sq in TRAP_SQUARES:
+        code = squares[sq]
+        if code != EMPTY and not NEIGHBOR_MASKS[sq] & occupied[code // 6]:
+            term += PIECE_VALUES[code % 6] if code >= 6 else -PIECE_VALUES[code % 6]
+    return term
+
+
+# material: valor de las piezas propias menos las rivales
+# trap: valor de las piezas rivales en trampas sin aliados menos el de las propias
+# adjacency: aliados adyacentes de cada pieza propia menos los de las rivales
+# column: valor de las piezas propias en las columnas 0 y 1 menos el de las rivales
+FEATURE_NAMES = ("material", "trap", "adjacency", "column")
+
+
+# Términos de FEATURE_NAMES desde el punto de vista de un color, O(1)
+def evaluation_terms(board, color):
+    material = board.material
+    pairs = board.friendly_pairs
+    column = board.column_material
+    other = 1 - color
+    trap = _trap_term(board)
+    return (
+        material[color] - material[other],
+        trap if color == GOLD else -trap,
+        2 * (pairs[color] - pairs[other]),
+        column[color] - column[other],
+    )
+
+
+# Heurística con nombre: suma de los términos por sus pesos, positiva a favor
+# de `color`. Se usa como función de evaluación: evaluator(board).
+class Evaluator:
+    __slots__ = ("name", "weights", "color")
+
+    def __init__(self, name, weights, color=GOLD):
+        if len(weights) != len(FEATURE_NAMES):
+            raise ValueError(f"Se esperaban {len(FEATURE_NAMES)} pesos para {name}, no {len(weights)}")
+        self.name = name
+        self.weights = tuple(weights)
+        self.color = color
+
+    def __call__(self, board):
+        material, trap, adjacency, column = evaluation_terms(board, self.color)
+        w = self.weights
+        return w[0] * material + w[1] * trap + w[2] * adjacency + w[3] * column
+
+    def __repr__(self):
+        weights = ", ".join(f"{name}={w}" for name, w in zip(FEATURE_NAMES, self.weights))
+        return f"Evaluator({self.name!r}, {weights}, color={self.color})"
+
+
+EVALUATORS = {}  # Nombre -> Evaluator
+
+
+def register_evaluator(evaluator):
+    EVALUATORS[evaluator.name] = evaluator
+    return evaluator
+
+
+def get_evaluator(name):
+    try:
+        return EVALUATORS[name]
+    except KeyError:
+        raise ValueError(f"Heurística desconocida: {name} (hay {', '.join(sorted(EVALUATORS))})") from None
+
+
+# Material, trampas y aliados adyacentes (positivo favorece a oro).
+# Usa los términos que el tablero mantiene en cada paso, así que es O(1);
+# cada par de aliados adyacentes suma 1 para cada una de sus dos piezas.
+def evaluate_board(board):
+    material = board.material
+    pairs = board.friendly_pairs
+    return (
+        material[GOLD] - material[SILVER] + _trap_term(board)
+        + 2 * (pairs[GOLD] - pairs[SILVER])
+    )
+
+
+# Material, trampas y cercanía a la columna 0 (positivo favorece a plata), O(1)
+def evaluate_board_column(board):
+    material = board.material
+    column = board.column_material
+    return (
+        material[SILVER] - material[GOLD] - _trap_term(board)
+        + (column[SILVER] - column[GOLD]) * 0.5
+    )
+
+
+# Las dos heurísticas originales, como entradas del registro: "board" es
+# evaluate_board y "column" es evaluate_board_column
+register_evaluator(Evaluator("board", (1, 1, 1, 0), GOLD))
+register_evaluator(Evaluator("column", (1, 1, 0, 0.5), SILVER))
+
+# Archivo de pesos por omisión; la variable de entorno ARIMAA_WEIGHTS lo cambia
+WEIGHTS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "weights.json")
+
+
+def default_weights_file():
+    return os.environ.get("ARIMAA_WEIGHTS", WEIGHTS_FILE)
+
+
+# Leer un archivo de pesos y registrar sus heurísticas, reemplazando las que
+# tengan el mismo nombre. Sin `path` se usa el archivo por omisión, que puede
+# no existir. Formato:
+#   {"evaluators": [{"name": "board", "color": "gold",
+#                    "weights": {"material": 1.0, "trap": 1.0, ...}}, ...]}
+def load_weights(path=None):
+    if path is None:
+        path = default_weights_file()
+        if not os.path.exists(path):
+            return []
+    with open(path) as f:
+        data = json.load(f)
+    loaded = []
+    for entry in data.get("evaluators", []):
+        weights = entry["weights"]
+        missing = [name for name in FEATURE_NAMES if name not in weights]
+        if missing:
+            raise ValueError(f"Faltan pesos de {entry['name']} en {path}: {', '.join(missing)}")
+        loaded.append(register_evaluator(Evaluator(
+            entry["name"], [float(weights[name]) for name in FEATURE_NAMES],
+            COLOR_INDEX[entry.get("color", "gold")],
+        )))
+    return loaded
+
+
+# Guardar heurísticas en un archivo de pesos. Las que ya estaban en el archivo
+# con otro nombre se conservan.
+def save_weights(path, evaluators):
+    entries = {}
+    if os.path.exists(path):
+        with open(path) as f:
+            entries = {entry["name"]: entry for entry in json.load(f).get("evaluators", [])}
+    for evaluator in evaluators:
+        entries[evaluator.name] = {
+            "name": evaluator.name,
+            "color": COLOR_NAMES[evaluator.color],
+            "weights": dict(zip(FEATURE_NAMES, evaluator.weights)),
+        }
+    with open(path, "w") as f:
+        json.dump({"evaluators": list(entries.values())}, f, indent=2)
+        f.write("\n")
+
+
+# Versiones que recorren todas las piezas; sirven de referencia para
+# comprobar los términos incrementales
+def evaluate_board_full(board):
+    score = 0
+    for color in (GOLD, SILVER):
+        friends = board.occupied[color]
+        for sq in board.squares_of(color):
+            piece_value = PIECE_VALUES[board.squares[sq] % 6]
+            if color == GOLD:
+                score += piece_value
+            else:
+                score -= piece_value
+
+            # Penalizar si la pieza está en una trampa sin aliados adyacentes
+            allies_adjacent = (NEIGHBOR_MASKS[sq] & friends).bit_count()
+            if sq in TRAP_SQUARES and not allies_adjacent:
+                if color == GOLD:
+                    score -= piece_value
+                else:
+                    score += piece_value
+
+            # Bonificar si la pieza tiene aliados adyacentes
+            score += allies_adjacent if color == GOLD else -allies_adjacent
+
+    return score
+
+
+def evaluate_board_column_full(board):
+    score = 0
+    for color in (GOLD, SILVER):
+        friends = board.occupied[color]
+        for sq in board.squares_of(color):
+            piece_value = PIECE_VALUES[board.squares[sq] % 6]
+            if color == SILVER:
+                score += piece_value
+            else:
+                score -= piece_value
+
+            # Penalizar si la pieza está en una trampa sin aliados adyacentes
+            if sq in TRAP_SQUARES and not NEIGHBOR_MASKS[sq] & friends:
+                if color == SILVER:
+                    score -= piece_value
+                else:
+                    score += piece_value
+
+            # Bonificar si la pieza está cerca de la columna 0
+            if sq % COLS <= 1:  # Considerar cercanía si está en la columna 0 o 1
+                if color == SILVER:
+                    score += piece_value * 0.5
+                else:
+                    score -= piece_value * 0.5
+
+    return score
@@ -0,0 +1,148 @@
+# Planos de características y evaluación por lotes con NumPy.
+# NumPy es opcional: se importa solo al usar las funciones de este módulo.
+#
+# Cada posición se convierte en PLANES planos de 64 casillas:
+#   0..11  una pieza por plano (código de pieza = color * 6 + tipo)
+#   12, 13 aliados adyacentes a cada casilla, para oro y para plata
+#   14, 15 trampas con al menos un aliado adyacente, para oro y para plata
+# De los planos salen los términos de las heurísticas (evaluation.FEATURE_NAMES)
+# desde el punto de vista de oro; para plata se cambian de signo.
+from .board import COLS, GOLD, NEIGHBORS, PIECE_VALUES, ROWS, TRAP_SQUARES
+from .evaluation import FEATURE_NAMES, get_evaluator
+
+PLANES = 16
+PIECE_PLANES = 12
+ADJACENCY_PLANE = 12  # + color
+TRAP_SAFETY_PLANE = 14  # + color
+
+_tables = None
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("arimaa.features necesita NumPy (pip install numpy)") from None
+    return numpy
+
+
+# Se puede usar la evaluación por lotes
+def available():
+    try:
+        _numpy()
+    except ImportError:
+        return False
+    return True
+
+
+# Tablas por casilla y por pieza, creadas la primera vez que se usan
+def _get_tables():
+    global _tables
+    if _tables is None:
+        np = _numpy()
+        size = ROWS * COLS
+        # Vecinos de cada casilla; los que faltan apuntan a una casilla vacía extra
+        neighbors = np.full((size, 4), size, dtype=np.intp)
+        for sq, adjacent in enumerate(NEIGHBORS):
+            neighbors[sq, :len(adjacent)] = adjacent
+        signed_values = np.array(PIECE_VALUES + tuple(-v for v in PIECE_VALUES), dtype=np.float64)
+        traps = np.zeros(size, dtype=bool)
+        traps[list(TRAP_SQUARES)] = True
+        columns = np.array([sq % COLS <= 1 for sq in range(size)])
+        # Por código de pieza + 1 (el 0 es la casilla vacía): valor con signo y color
+        code_values = np.concatenate([[0.0], signed_values])
+        code_colors = np.array([-1] + [0] * 6 + [1] * 6, dtype=np.int8)
+        _tables = (np, neighbors, signed_values, traps, columns, code_values, code_colors)
+    return _tables
+
+
+# Matriz (N, 64) de códigos de pieza a partir de tableros o de listas de casillas
+def squares_array(positions):
+    np = _get_tables()[0]
+    rows = [getattr(position, "squares", position) for position in positions]
+    return np.array(rows, dtype=np.int8).reshape(len(rows), ROWS * COLS)
+
+
+# Aliados adyacentes a cada casilla, a partir de la matriz (N, 64) de casillas
+# ocupadas por un color
+def _adjacent_counts(np, neighbors, occupied):
+    empty = np.zeros((occupied.shape[0], 1), dtype=bool)
+    return np.concatenate([occupied, empty], axis=1)[:, neighbors].sum(axis=2)
+
+
+# Términos (N, len(FEATURE_NAMES)) para oro a partir del valor con signo de
+# cada casilla, las casillas de cada color y sus aliados adyacentes. Los usan
+# tanto los planos como el camino rápido, así que calculan lo mismo.
+def _terms(np, values, gold, silver, gold_adjacent, silver_adjacent):
+    traps, columns = _get_tables()[3:5]
+    alone = (gold & (gold_adjacent == 0)) | (silver & (silver_adjacent == 0))
+    features = np.empty((values.shape[0], len(FEATURE_NAMES)), dtype=np.float64)
+    features[:, 0] = values.sum(axis=1)
+    features[:, 1] = -(values * (alone & traps)).sum(axis=1)
+    features[:, 2] = (gold * gold_adjacent).sum(axis=1) - (silver * silver_adjacent).sum(axis=1)
+    features[:, 3] = (values * columns).sum(axis=1)
+    return features
+
+
+# Planos (N, PLANES, 64) de un lote de posiciones
+def board_planes(positions):
+    np, neighbors, _, traps = _get_tables()[:4]
+    squares = squares_array(positions)
+    pieces = squares[:, None, :] == np.arange(PIECE_PLANES, dtype=np.int8)[None, :, None]
+    adjacency = np.stack([
+        _adjacent_counts(np, neighbors, pieces[:, :6].any(axis=1)),
+        _adjacent_counts(np, neighbors, pieces[:, 6:].any(axis=1)),
+    ], axis=1)
+    trap_safety = (adjacency > 0) & traps
+    return np.concatenate([pieces, adjacency, trap_safety], axis=1).astype(np.uint8)
+
+
+# Términos (N, len(FEATURE_NAMES)) a partir de los planos, para oro
+def planes_features(planes):
+    np, _, signed_values = _get_tables()[:3]
+    pieces = planes[:, :PIECE_PLANES]
+    # Valor con signo de la pieza de cada casilla (oro positivo)
+    values = np.einsum("npq,p->nq", pieces, signed_values)
+    return _terms(
+        np, values, pieces[:, :6].any(axis=1), pieces[:, 6:].any(axis=1),
+        planes[:, ADJACENCY_PLANE].astype(np.int64), planes[:, ADJACENCY_PLANE + 1].astype(np.int64),
+    )
+
+
+# Los mismos términos calculados directamente de las casillas, sin armar los
+# planos: es el camino rápido para evaluar
+def position_features(positions):
+    np, neighbors, _, _, _, code_values, code_colors = _get_tables()
+    squares = squares_array(positions).astype(np.intp) + 1
+    values = code_values[squares]
+    colors = code_colors[squares]
+    gold = colors == 0
+    silver = colors == 1
+    return _terms(
+        np, values, gold, silver,
+        _adjacent_counts(np, neighbors, gold), _adjacent_counts(np, neighbors, silver),
+    )
+
+
+# Puntajes de un lote de posiciones con una heurística del registro (o un
+# Evaluator), con la misma convención de signo que evaluator(board)
+def evaluate_batch(positions, evaluator="board"):
+    np = _get_tables()[0]
+    if isinstance(evaluator, str):
+        evaluator = get_evaluator(evaluator)
+    if not len(positions):
+        return np.zeros(0)
+    weights = np.asarray(evaluator.weights, dtype=np.float64)
+    if evaluator.color != GOLD:
+        weights = -weights
+    return position_features(positions) @ weights
+
+
+# Función de evaluación por lotes para Searcher(batch_evaluate=...)
+def batch_evaluator(evaluator="board"):
+    if isinstance(evaluator, str):
+        evaluator = get_evaluator(evaluator)
+
+    def evaluate(positions):
+        return evaluate_batch(positions, evaluator)
+    return evaluate
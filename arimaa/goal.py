@@ -0,0 +1,97 @@
+# Detección rápida de amenazas de meta. Se inunda con máscaras de bits el
+# conjunto de casillas que puede alcanzar cada conejo con los pasos dados,
+# suponiendo que el resto de las piezas se quedan quietas: las casillas
+# ocupadas bloquean, un conejo que queda junto a una rival más fuerte sin
+# aliados se congela y uno que pisa una trampa sin aliados cae en ella.
+from .board import ROWS, COLS, FULL_MASK, GOLD, RABBIT, ROW_MASKS, TRAP_MASK
+from .movegen import STEPS_PER_TURN, is_frozen
+
+# Columnas de los bordes, para que los corrimientos laterales no den la vuelta
+_NOT_FIRST_COLUMN = 0
+_NOT_LAST_COLUMN = 0
+for _row in ROW_MASKS:
+    _NOT_FIRST_COLUMN |= _row & ~(_row & -_row)
+    _NOT_LAST_COLUMN |= _row & ~(1 << (_row.bit_length() - 1))
+
+# Filas desde las que un conejo puede llegar a la meta con 1..STEPS_PER_TURN pasos
+GOAL_ZONES = []
+for _color in range(2):
+    _zones = []
+    for _steps in range(STEPS_PER_TURN + 1):
+        _mask = 0
+        for _d in range(1, _steps + 1):
+            _mask |= ROW_MASKS[ROWS - 1 - _d] if _color == GOLD else ROW_MASKS[_d]
+        _zones.append(_mask)
+    GOAL_ZONES.append(tuple(_zones))
+GOAL_ZONES = tuple(GOAL_ZONES)
+
+
+# Casillas vecinas de todas las de una máscara
+def adjacent_mask(mask):
+    return (
+        (mask << COLS | mask >> COLS | (mask & _NOT_LAST_COLUMN) << 1
+         | (mask & _NOT_FIRST_COLUMN) >> 1) & FULL_MASK
+    )
+
+
+# Menor número de pasos con que un conejo del color llega a la meta moviéndose
+# solo, o None si ninguno llega con max_steps pasos (a lo sumo STEPS_PER_TURN)
+def goal_distance(board, color, max_steps=STEPS_PER_TURN):
+    goal_row = ROW_MASKS[ROWS - 1] if color == GOLD else ROW_MASKS[0]
+    rabbits = board.bitboards[color * 6 + RABBIT]
+    if rabbits & goal_row:
+        return 0
+    candidates = rabbits & GOAL_ZONES[color][min(max_steps, STEPS_PER_TURN)]
+    if not candidates:
+        return None
+    own = board.occupied[color]
+    enemy = board.occupied[1 - color]
+    empty = FULL_MASK & ~(own | enemy)
+    near_stronger = adjacent_mask(enemy & ~board.bitboards[(1 - color) * 6 + RABBIT])
+
+    # Primero se inunda desde todos los conejos a la vez contando como aliadas
+    # a todas las piezas propias. Alcanza un superconjunto de las casillas de
+    # cada conejo por separado, así que si no llega a la meta ninguno llega.
+    supported = adjacent_mask(own)
+    if _flood(candidates, color, near_stronger & ~supported,
+              empty & ~(TRAP_MASK & ~supported), goal_row, max_steps) is None:
+        return None
+
+    best = None
+    while candidates:
+        low = candidates & -candidates
+        candidates ^= low
+        if is_frozen(board, low.bit_length() - 1):
+            continue
+        supported = adjacent_mask(own & ~low)
+        steps = _flood(low, color, near_stronger & ~supported,
+                       empty & ~(TRAP_MASK & ~supported), goal_row,
+                       max_steps if best is None else best - 1)
+        if steps is not None:
+            best = steps
+    return best
+
+
+# Pasos hasta que la inundación desde `start` toca la fila de meta, o None.
+# Las casillas de `frozen` se alcanzan pero no se sale de ellas.
+def _flood(start, color, frozen, passable, goal_row, max_steps):
+    frontier = reached = start
+    for steps in range(1, max_steps + 1):
+        moving = frontier & ~frozen if steps > 1 else frontier
+        if color == GOLD:
+            frontier = moving << COLS
+        else:
+            frontier = moving >> COLS
+        frontier |= (moving & _NOT_LAST_COLUMN) << 1 | (moving & _NOT_FIRST_COLUMN) >> 1
+        frontier &= passable & ~reached
+        if not frontier:
+            return None
+        if frontier & goal_row:
+            return steps
+        reached |= frontier
+    return None
+
+
+# El color tiene un conejo que puede llegar a la meta en un turno
+def goal_threat(board, color, steps=STEPS_PER_TURN):
+    return goal_distance(board, color, steps) is not None
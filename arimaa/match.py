@@ -0,0 +1,249 @@
+# Partidas entre dos motores sin interfaz, para saber si un cambio en una
+# heurística o en la búsqueda mejora al motor. Las partidas se juegan de a
+# pares: la misma salida con semilla dos veces, cambiando los colores, y los
+# pares se reparten entre procesos. Después de cada par se aplica un test
+# secuencial de razón de probabilidades (SPRT) y se corta en cuanto decide.
+#
+# Uso:
+#   python -m arimaa.match --a board --b column --games 200 --workers 4
+#   python -m arimaa.match --a board --b board --options-b '{"pvs": false}'
+# El resultado es JSON, desde el punto de vista del motor A.
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import time
+
+from .board import GOLD, SILVER
+from .evaluation import get_evaluator, load_weights
+from .rules import GameState
+from .search import Searcher
+from .tuning import write_game_records
+
+MAX_TURNS = 150  # Turnos por partida antes de darla por empatada
+VARIANCE_FLOOR = 1e-3  # Varianza mínima de los pares en el SPRT
+
+
+# Motor de una partida: heurística del registro y opciones de Searcher
+class Engine:
+    def __init__(self, label, evaluator, depth=1, time_limit=None, options=None):
+        self.label = label
+        self.evaluator = get_evaluator(evaluator) if isinstance(evaluator, str) else evaluator
+        self.depth = depth
+        self.time_limit = time_limit
+        self.options = options or {}
+
+    def searcher(self):
+        return Searcher(evaluate=self.evaluator, depth=self.depth,
+                        time_limit=self.time_limit, **self.options)
+
+
+# Jugar una partida desde la salida de `seed`. Devuelve el ganador (None si
+# se llega a max_turns), los turnos jugados y las casillas al empezar cada turno.
+# pick_turn: función que recibe el estado y puede devolver un turno para jugar
+# en lugar del que elige el motor (None deja elegir al motor)
+def play_game(seed, gold, silver, max_turns=MAX_TURNS, pick_turn=None):
+    state = GameState.new_game(seed)
+    searchers = {GOLD: gold.searcher(), SILVER: silver.searcher()}
+    positions = []
+    for turn in range(max_turns):
+        result = state.winner()
+        if result is not None:
+            return result, turn, positions
+        positions.append(tuple(state.board.squares))
+        move = pick_turn(state) if pick_turn is not None else None
+        if move is None:
+            move = searchers[state.turn].get_best_move(state)
+        if not move:
+            # Sin movimientos legales pierde el color que mueve
+            return 1 - state.turn, turn, positions
+        state.apply_move(move)
+        state.end_turn()
+    return state.winner(), max_turns, positions
+
+
+# Jugar un par de partidas con la misma salida: A con oro y luego A con plata.
+# Devuelve los puntos de A en cada una (1, 0.5 o 0) y los datos de las partidas.
+def play_pair(seed, engine_a, engine_b, max_turns=MAX_TURNS):
+    games = []
+    for gold, silver in ((engine_a, engine_b), (engine_b, engine_a)):
+        result, turns, positions = play_game(seed, gold, silver, max_turns)
+        if result is None:
+            score = 0.5
+        else:
+            score = 1.0 if (result == GOLD) == (gold is engine_a) else 0.0
+        games.append((score, result, turns, positions))
+    return seed, games
+
+
+def _play_pair_task(args):
+    return play_pair(*args)
+
+
+# Puntaje esperado con una diferencia de Elo
+def expected_score(elo):
+    return 1 / (1 + 10 ** (-elo / 400))
+
+
+# Diferencia de Elo que corresponde a un puntaje medio
+def elo_from_score(score):
+    score = min(max(score, 1e-6), 1 - 1e-6)
+    return -400 * math.log10(1 / score - 1)
+
+
+# Varianza muestral de los puntajes medios de cada par, no menor que
+# VARIANCE_FLOOR para que el test pueda decidir aunque todos terminen igual
+def pair_variance(pair_scores):
+    n = len(pair_scores)
+    if n < 2:
+        return VARIANCE_FLOOR
+    mean = sum(pair_scores) / n
+    variance = sum((s - mean) ** 2 for s in pair_scores) / (n - 1)
+    return max(variance, VARIANCE_FLOOR)
+
+
+# Logaritmo de la razón de verosimilitud entre H1 (diferencia elo1) y H0
+# (diferencia elo0), con la aproximación normal sobre los puntajes medios de
+# cada par: los dos juegos de un par comparten salida y no son independientes.
+def sprt_llr(pair_scores, elo0, elo1):
+    n = len(pair_scores)
+    if n < 2:
+        return 0.0
+    mean = sum(pair_scores) / n
+    variance = pair_variance(pair_scores)
+    s0 = expected_score(elo0)
+    s1 = expected_score(elo1)
+    return n * (s1 - s0) * (2 * mean - s0 - s1) / (2 * variance)
+
+
+# Límites del SPRT para errores alpha (aceptar H1 siendo falsa) y beta
+def sprt_bounds(alpha, beta):
+    return math.log(beta / (1 - alpha)), math.log((1 - beta) / alpha)
+
+
+# Resumen del match hasta el momento, para el motor A
+def match_report(pairs, elapsed, elo0, elo1, alpha, beta):
+    scores = [score for _, games in pairs for score, _, _, _ in games]
+    pair_scores = [sum(score for score, _, _, _ in games) / len(games) for _, games in pairs]
+    games = len(scores)
+    mean = sum(scores) / games if games else 0.5
+    n = len(pair_scores)
+    spread = 0.0
+    if n > 1:
+        spread = 1.96 * math.sqrt(pair_variance(pair_scores) / n)
+    llr = sprt_llr(pair_scores, elo0, elo1)
+    lower, upper = sprt_bounds(alpha, beta)
+    return {
+        "games": games,
+        "wins": scores.count(1.0),
+        "losses": scores.count(0.0),
+        "draws": scores.count(0.5),
+        "score": mean,
+        "elo": elo_from_score(mean),
+        "elo_interval": [elo_from_score(mean - spread), elo_from_score(mean + spread)],
+        "average_turns": (
+            sum(turns for _, games in pairs for _, _, turns, _ in games) / games if games else 0.0
+        ),
+        "seconds": elapsed,
+        "games_per_minute": games * 60 / elapsed if elapsed else 0.0,
+        "sprt": {
+            "elo0": elo0,
+            "elo1": elo1,
+            "llr": llr,
+            "bounds": [lower, upper],
+            "result": "H1" if llr >= upper else "H0" if llr <= lower else None,
+        },
+    }
+
+
+# Jugar hasta `games` partidas (en pares) entre los motores A y B repartidas
+# en `workers` procesos. Con sprt=True se corta cuando el test decide. Con
+# `records` se agregan las posiciones de cada partida a ese archivo de
+# registro (ver arimaa.tuning). `on_pair` recibe el resumen tras cada par.
+def run_match(engine_a, engine_b, games=100, workers=None, seed=0, max_turns=MAX_TURNS,
+              sprt=True, elo0=0.0, elo1=10.0, alpha=0.05, beta=0.05, records=None,
+              on_pair=None):
+    workers = workers if workers is not None else os.cpu_count() or 1
+    tasks = [(seed + i, engine_a, engine_b, max_turns) for i in range((games + 1) // 2)]
+    pairs = []
+    start = time.perf_counter()
+    pool = multiprocessing.Pool(workers) if workers > 1 else None
+    try:
+        results = pool.imap_unordered(_play_pair_task, tasks) if pool else map(_play_pair_task, tasks)
+        for pair in results:
+            pairs.append(pair)
+            if records:
+                for _, result, _, positions in pair[1]:
+                    write_game_records(records, positions, result)
+            report = match_report(pairs, time.perf_counter() - start, elo0, elo1, alpha, beta)
+            if on_pair is not None:
+                on_pair(report)
+            if sprt and report["sprt"]["result"] is not None:
+                break
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+    report = match_report(pairs, time.perf_counter() - start, elo0, elo1, alpha, beta)
+    report["engines"] = {
+        engine.label: {
+            "evaluator": repr(engine.evaluator),
+            "depth": engine.depth,
+            "time_limit": engine.time_limit,
+            "options": engine.options,
+        }
+        for engine in (engine_a, engine_b)
+    }
+    report["workers"] = workers
+    return report
+
+
+def _print_progress(report):
+    print(f"{report['games']} partidas: +{report['wins']} -{report['losses']} ={report['draws']}"
+          f"  Elo {report['elo']:+.1f}  LLR {report['sprt']['llr']:.2f}"
+          f"  {report['games_per_minute']:.1f} partidas/min", flush=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Match entre dos motores de Arimaa con SPRT")
+    parser.add_argument("--a", default="board", help="heurística del motor A")
+    parser.add_argument("--b", default="column", help="heurística del motor B")
+    parser.add_argument("--options-a", type=json.loads, default={}, help="opciones de Searcher en JSON")
+    parser.add_argument("--options-b", type=json.loads, default={}, help="opciones de Searcher en JSON")
+    parser.add_argument("--depth", type=int, default=1, help="profundidad por jugada, en turnos")
+    parser.add_argument("--time-limit", type=float, help="segundos por jugada (en lugar de la profundidad)")
+    parser.add_argument("--games", type=int, default=100, help="máximo de partidas")
+    parser.add_argument("--workers", type=int, help="procesos (por omisión, uno por CPU)")
+    parser.add_argument("--seed", type=int, default=0, help="semilla de la primera salida")
+    parser.add_argument("--max-turns", type=int, default=MAX_TURNS)
+    parser.add_argument("--no-sprt", action="store_true", help="jugar todas las partidas")
+    parser.add_argument("--elo0", type=float, default=0.0, help="diferencia de Elo de H0")
+    parser.add_argument("--elo1", type=float, default=10.0, help="diferencia de Elo de H1")
+    parser.add_argument("--alpha", type=float, default=0.05)
+    parser.add_argument("--beta", type=float, default=0.05)
+    parser.add_argument("--weights", help="archivo de pesos (por omisión, el que carga el motor)")
+    parser.add_argument("--records", help="agregar las posiciones jugadas a este registro")
+    parser.add_argument("--output", help="archivo JSON de salida (por omisión, la salida estándar)")
+    args = parser.parse_args(argv)
+
+    load_weights(args.weights)
+    engines = [
+        Engine(label, name, args.depth, args.time_limit, options)
+        for label, name, options in (("A", args.a, args.options_a), ("B", args.b, args.options_b))
+    ]
+    report = run_match(
+        *engines, games=args.games, workers=args.workers, seed=args.seed,
+        max_turns=args.max_turns, sprt=not args.no_sprt, elo0=args.elo0, elo1=args.elo1,
+        alpha=args.alpha, beta=args.beta, records=args.records, on_pair=_print_progress,
+    )
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
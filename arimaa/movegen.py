@@ -0,0 +1,209 @@
+# Generador de movimientos: pasos simples, empujes y jalones.
+# Un movimiento es una tupla de pasos (casilla inicial, casilla final):
+#   paso simple: ((inicio, fin),)
+#   empuje:      ((rival, destino), (propia, rival))
+#   jalón:       ((propia, destino), (rival, propia))
+from .board import (
+    GOLD, ROWS, COLS, RABBIT, EMPTY, FULL_MASK, TRAP_MASK, NEIGHBORS,
+    NEIGHBOR_MASKS,
+)
+
+STEPS_PER_TURN = 4  # Movimientos por turno
+
+# Casillas a las que puede avanzar un conejo: nunca hacia atrás.
+# Oro avanza hacia la fila 7 y plata hacia la fila 0.
+RABBIT_STEP_MASKS = []
+for _color in range(2):
+    _backward = -COLS if _color == GOLD else COLS
+    _masks = []
+    for _sq in range(ROWS * COLS):
+        _mask = NEIGHBOR_MASKS[_sq]
+        if 0 <= _sq + _backward < ROWS * COLS:
+            _mask &= ~(1 << (_sq + _backward))
+        _masks.append(_mask)
+    RABBIT_STEP_MASKS.append(tuple(_masks))
+RABBIT_STEP_MASKS = tuple(RABBIT_STEP_MASKS)
+
+# Trampas que pueden quedar sin defensa cuando una pieza sale de una casilla
+TRAPS_NEAR = tuple(
+    tuple(n for n in NEIGHBORS[_sq] if TRAP_MASK >> n & 1)
+    for _sq in range(ROWS * COLS)
+)
+
+# Tipos de pieza más fuertes que cada tipo
+STRONGER_TYPES = tuple(tuple(range(_t + 1, 6)) for _t in range(6))
+
+
+# Máscaras de dominancia de un color frente a las piezas rivales:
+# stronger[t] son las rivales más fuertes que el tipo t y weaker[t] las más débiles
+def dominance_masks(board, color):
+    enemy_boards = board.bitboards[(1 - color) * 6:(1 - color) * 6 + 6]
+    stronger = [0] * 6
+    weaker = [0] * 6
+    for t in range(4, -1, -1):
+        stronger[t] = stronger[t + 1] | enemy_boards[t + 1]
+    for t in range(1, 6):
+        weaker[t] = weaker[t - 1] | enemy_boards[t - 1]
+    return stronger, weaker
+
+
+# Una pieza está congelada si tiene al lado una rival más fuerte y ningún aliado
+def is_frozen(board, sq):
+    code = board.squares[sq]
+    if code == EMPTY:
+        return False
+    color = code // 6
+    neighbors = NEIGHBOR_MASKS[sq]
+    if neighbors & board.occupied[color]:
+        return False
+    enemy = (1 - color) * 6
+    for t in STRONGER_TYPES[code % 6]:
+        if neighbors & board.bitboards[enemy + t]:
+            return True
+    return False
+
+
+# Verificar si la pieza de una casilla cae en una trampa sin aliados adyacentes
+def is_trapped(board, sq):
+    code = board.squares[sq]
+    return (
+        code != EMPTY and TRAP_MASK >> sq & 1 == 1
+        and not NEIGHBOR_MASKS[sq] & board.occupied[code // 6]
+    )
+
+
+# Generar todos los movimientos del color con los pasos que le quedan
+def generate_moves(board, color, steps_left=STEPS_PER_TURN):
+    moves = []
+    if steps_left <= 0:
+        return moves
+    bitboards = board.bitboards
+    own = board.occupied[color]
+    empty = FULL_MASK & ~(own | board.occupied[1 - color])
+    stronger, weaker = dominance_masks(board, color)
+    rabbit_steps = RABBIT_STEP_MASKS[color]
+    can_push = steps_left >= 2
+
+    for t in range(6):
+        pieces = bitboards[color * 6 + t]
+        while pieces:
+            low = pieces & -pieces
+            pieces ^= low
+            sq = low.bit_length() - 1
+            neighbors = NEIGHBOR_MASKS[sq]
+            # Las piezas congeladas no se mueven
+            if neighbors & stronger[t] and not neighbors & own:
+                continue
+            free = neighbors & empty
+            targets = rabbit_steps[sq] & empty if t == RABBIT else free
+            while targets:
+                bit = targets & -targets
+                targets ^= bit
+                moves.append(((sq, bit.bit_length() - 1),))
+            if not can_push:
+                continue
+            victims = neighbors & weaker[t]
+            while victims:
+                bit = victims & -victims
+                victims ^= bit
+                victim = bit.bit_length() - 1
+                # Empujar la pieza rival a una casilla vacía junto a ella
+                dests = NEIGHBOR_MASKS[victim] & empty
+                while dests:
+                    dbit = dests & -dests
+                    dests ^= dbit
+                    moves.append(((victim, dbit.bit_length() - 1), (sq, victim)))
+                # Jalar: la pieza propia se aparta y la rival ocupa su lugar
+                dests = free
+                while dests:
+                    dbit = dests & -dests
+                    dests ^= dbit
+                    moves.append(((sq, dbit.bit_length() - 1), (victim, sq)))
+    return moves
+
+
+# Movimientos de una sola pieza propia (para la interfaz)
+def generate_piece_moves(board, sq, steps_left=STEPS_PER_TURN):
+    code = board.squares[sq]
+    if code == EMPTY:
+        return []
+    return [
+        move for move in generate_moves(board, code // 6, steps_left)
+        if move[0][0] == sq or (len(move) == 2 and move[1][0] == sq)
+    ]
+
+
+# Aplicar un paso y capturar las piezas que queden solas en una trampa.
+# Solo pueden caer la pieza que llega a una trampa o una vecina de la que sale.
+def make_step(board, start, end):
+    board.move(start, end)
+    captured = []
+    if TRAP_MASK >> end & 1 and not NEIGHBOR_MASKS[end] & board.occupied[board.squares[end] // 6]:
+        captured.append((end, board.remove(end)))
+    for trap in TRAPS_NEAR[start]:
+        if is_trapped(board, trap):
+            captured.append((trap, board.remove(trap)))
+    return captured
+
+
+# Aplicar un movimiento; devuelve la información para deshacerlo
+def make_move(board, move):
+    return [(start, end, make_step(board, start, end)) for start, end in move]
+
+
+# Deshacer un movimiento aplicado con make_move
+def unmake_move(board, undo):
+    for start, end, captured in reversed(undo):
+        for sq, code in captured:
+            board.put(sq, code // 6, code % 6)
+        board.move(end, start)
+
+
+# Piezas capturadas por un movimiento ya aplicado
+def captured_pieces(undo):
+    return [piece for _, _, captured in undo for piece in captured]
+
+
+
+# Recorrer los turnos completos (de 1 a steps_left pasos) de un color.
+# Los órdenes de pasos que llegan a la misma posición final se cuentan una sola
+# vez, y no se acepta un turno que deje el tablero igual que al inicio.
+# Cada turno es una tupla de pasos. Mientras el llamador procesa un turno, el
+# tablero queda en la posición final de ese turno y no debe modificarse sin
+# deshacer los cambios; así la búsqueda evalúa cada turno sin volver a aplicarlo
+# y puede cortar el recorrido en cuanto tiene una poda. Al terminar (o al
+# cerrar el generador) el tablero vuelve a la posición inicial.
+# order: función opcional (board, color, movimientos) -> movimientos que decide
+# en qué orden se prueban los movimientos de cada paso.
+def iter_turns(board, color, steps_left=STEPS_PER_TURN, order=None):
+    start_hash = board.hash
+    seen = set()  # Posiciones finales ya devueltas
+    expanded = {}  # Posición intermedia -> mayor número de pasos con que se expandió
+    steps = []
+
+    def expand(steps_left):
+        moves = generate_moves(board, color, steps_left)
+        if order is not None:
+            moves = order(board, color, moves)
+        for move in moves:
+            undo = make_move(board, move)
+            steps.extend(move)
+            try:
+                key = board.hash
+                if key != start_hash and key not in seen:
+                    seen.add(key)
+                    yield tuple(steps)
+                remaining = steps_left - len(move)
+                if remaining > 0 and expanded.get(key, 0) < remaining:
+                    expanded[key] = remaining
+                    yield from expand(remaining)
+            finally:
+                del steps[-len(move):]
+                unmake_move(board, undo)
+
+    return expand(steps_left)
+
+
+# Lista de todos los turnos distintos de un color
+def generate_turns(board, color, steps_left=STEPS_PER_TURN):
+    return list(iter_turns(board, color, steps_left))
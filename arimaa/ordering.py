@@ -0,0 +1,92 @@
+# Orden de los movimientos dentro de la búsqueda. Se aplica a los movimientos
+# de cada paso al generar los turnos: primero los que capturan una pieza rival
+# en una trampa, después los pasos asesinos del ply y al final los demás según
+# la tabla de historia. El turno de la tabla de transposición va antes que todos
+# (ver ordered_turns).
+from .board import NEIGHBOR_MASKS, PIECE_VALUES, TRAP_MASK
+from .movegen import TRAPS_NEAR
+
+KILLERS_PER_PLY = 2  # Turnos asesinos que se recuerdan por ply
+CAPTURE_SCORE = 1 << 40  # Por encima de cualquier valor de la historia
+KILLER_SCORE = 1 << 39
+
+
+# Valor de la pieza rival que captura un empuje o jalón, o 0 si no captura.
+# Solo un movimiento que desplaza una pieza rival puede dejarla sola en una
+# trampa: cuando la propia rival cae en ella o cuando se aleja la última
+# defensora de otra rival que ya estaba en la trampa.
+def capture_value(board, color, move):
+    if len(move) < 2:
+        return 0
+    squares = board.squares
+    enemy_start = (1 - color) * 6
+    start, end = move[0]
+    if not enemy_start <= squares[start] < enemy_start + 6:
+        start, end = move[1]
+    # Rivales que quedan en el tablero después de mover la víctima
+    defenders = board.occupied[1 - color] & ~(1 << start) | 1 << end
+    value = 0
+    if TRAP_MASK >> end & 1 and not NEIGHBOR_MASKS[end] & defenders:
+        value += PIECE_VALUES[squares[start] % 6]
+    for trap in TRAPS_NEAR[start]:
+        code = squares[trap]
+        if (trap != end and enemy_start <= code < enemy_start + 6
+                and not NEIGHBOR_MASKS[trap] & defenders):
+            value += PIECE_VALUES[code % 6]
+    return value
+
+
+class MoveOrdering:
+    def __init__(self):
+        self.killers = []  # Por ply: turnos que produjeron una poda beta
+        self.killer_steps = []  # Por ply: pasos de esos turnos
+        self.history = [[0] * 4096 for _ in range(2)]  # [color][inicio * 64 + fin]
+
+    # Olvidar los asesinos y reducir la historia entre una búsqueda y la siguiente
+    def new_search(self):
+        self.killers = []
+        self.killer_steps = []
+        for table in self.history:
+            for i, value in enumerate(table):
+                if value:
+                    table[i] = value >> 1
+
+    # Registrar un turno que produjo una poda beta a cierta profundidad restante
+    def record_cutoff(self, color, turn, ply, depth):
+        while len(self.killers) <= ply:
+            self.killers.append([])
+            self.killer_steps.append(frozenset())
+        killers = self.killers[ply]
+        if turn not in killers:
+            killers.insert(0, turn)
+            del killers[KILLERS_PER_PLY:]
+            self.killer_steps[ply] = frozenset(step for killer in killers for step in killer)
+        history = self.history[color]
+        bonus = depth * depth
+        for start, end in turn:
+            history[start * 64 + end] += bonus
+
+    # Función de orden para iter_turns en un ply
+    def order_for(self, ply):
+        killer_steps = self.killer_steps[ply] if ply < len(self.killer_steps) else frozenset()
+        history_tables = self.history
+
+        def order(board, color, moves):
+            history = history_tables[color]
+            scored = []
+            for move in moves:
+                value = capture_value(board, color, move)
+                if value:
+                    score = CAPTURE_SCORE + value
+                elif move[0] in killer_steps:
+                    score = KILLER_SCORE
+                else:
+                    score = 0
+                    for start, end in move:
+                        score += history[start * 64 + end]
+                scored.append((score, move))
+            # El orden es estable: a igual puntaje se respeta el del generador
+            scored.sort(key=lambda item: item[0], reverse=True)
+            return [move for _, move in scored]
+
+        return order
@@ -0,0 +1,303 @@
+# Búsqueda en paralelo: los turnos de la raíz se reparten entre procesos.
+# Cada proceso reconstruye el tablero a partir de una copia serializada y
+# comparte con los demás el mejor puntaje de la raíz (alfa) para podar.
+import multiprocessing
+import os
+import time
+
+from .board import Board
+from .evaluation import evaluate_board
+from .movegen import generate_turns, make_move, unmake_move
+from .rules import GameState
+from .search import Searcher, SearchTimeout, WIN_SCORE, MAX_DEPTH
+from .tt import SharedTranspositionTable
+
+CHUNKS_PER_WORKER = 4  # Grupos de turnos por proceso, para repartir la carga
+
+# Estado propio de cada proceso de trabajo, creado por _init_worker
+_worker_searcher = None
+_shared_alpha = None
+_worker_generation = 0  # Última búsqueda (get_best_move) vista por el proceso
+
+
+# Copia serializable del estado de la partida
+def state_to_payload(state):
+    return tuple(state.board.squares), state.turn, state.remaining_moves
+
+
+def state_from_payload(payload):
+    squares, turn, remaining_moves = payload
+    return GameState(Board.from_squares(squares), turn, remaining_moves)
+
+
+def _init_worker(alpha, evaluate, evaluate_color, tt_size):
+    global _worker_searcher, _shared_alpha
+    _shared_alpha = alpha
+    _worker_searcher = Searcher(evaluate=evaluate, evaluate_color=evaluate_color, tt_size=tt_size)
+
+
+# Reloj de pared para pasar a los procesos un límite absoluto: todos cortan a
+# la misma hora aunque empiecen su grupo de turnos más tarde
+def _local_deadline(deadline):
+    if deadline is None:
+        return None
+    return time.perf_counter() + (deadline - time.time())
+
+
+# Buscar un grupo de turnos de la raíz hasta la hora `deadline` (time.time(),
+# o None sin límite). `generation` numera las llamadas a get_best_move: con el
+# primer grupo de cada una el proceso envejece su tabla y su orden de
+# movimientos. Devuelve [(índice, puntaje, exacto)] y los nodos visitados;
+# `exacto` indica que el puntaje superó al alfa usado.
+def _search_root_turns(payload, indexed_turns, depth, deadline, generation):
+    global _worker_generation
+    state = state_from_payload(payload)
+    board = state.board
+    color = state.turn
+    searcher = _worker_searcher
+    if generation != _worker_generation:
+        _worker_generation = generation
+        searcher.transposition_table.new_search()
+        if searcher.ordering is not None:
+            searcher.ordering.new_search()
+    searcher.nodes = 0
+    searcher.deadline = _local_deadline(deadline)
+    results = []
+    try:
+        for index, turn in indexed_turns:
+            alpha = _shared_alpha.value
+            undo = make_move(board, turn)
+            try:
+                value = searcher.minimax(board, 1 - color, depth - 1, alpha, float('inf'), False)
+            except SearchTimeout:
+                break
+            finally:
+                unmake_move(board, undo)
+            results.append((index, value, value > alpha))
+            with _shared_alpha.get_lock():
+                if value > _shared_alpha.value:
+                    _shared_alpha.value = value
+    finally:
+        searcher.deadline = None
+    return results, searcher.nodes
+
+
+class ParallelSearcher:
+    # workers: número de procesos; con 1 se usa Searcher en el mismo proceso,
+    # lo que da resultados deterministas
+    def __init__(self, evaluate=evaluate_board, evaluate_color=None, depth=2,
+                 time_limit=None, workers=None, tt_size=1 << 18):
+        self.depth = depth
+        self.time_limit = time_limit
+        self.workers = workers if workers is not None else os.cpu_count() or 1
+        self.generation = 0
+        self.nodes = 0
+        self.pool = None
+        self.searcher = None
+        if self.workers <= 1:
+            self.searcher = Searcher(evaluate=evaluate, evaluate_color=evaluate_color,
+                                     depth=depth, time_limit=time_limit, tt_size=tt_size)
+        else:
+            self.alpha = multiprocessing.Value('d', float('-inf'))
+            self.pool = multiprocessing.Pool(
+                self.workers, initializer=_init_worker,
+                initargs=(self.alpha, evaluate, evaluate_color, tt_size),
+            )
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.terminate()
+            self.pool.join()
+            self.pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # Buscar la raíz a una profundidad fija repartiendo los turnos.
+    # El primer turno (el mejor de la iteración anterior) se busca solo para
+    # fijar un alfa inicial; el resto se reparte en grupos entre los procesos.
+    # `deadline` es la hora (time.time()) de corte; con first_untimed el primer
+    # turno se busca sin límite, para tener siempre una jugada.
+    # Devuelve (índice del mejor turno, puntaje, completo).
+    def search_root(self, payload, turns, depth, deadline, first_untimed=False):
+        self.alpha.value = float('-inf')
+        first_deadline = None if first_untimed else deadline
+        results, nodes = self.pool.apply(
+            _search_root_turns, (payload, [(0, turns[0])], depth, first_deadline, self.generation),
+        )
+        self.nodes += nodes
+        if not results:
+            return None, None, False
+
+        rest = list(enumerate(turns))[1:]
+        chunk_count = min(len(rest), self.workers * CHUNKS_PER_WORKER)
+        chunks = [rest[i::chunk_count] for i in range(chunk_count)]
+        tasks = [
+            self.pool.apply_async(_search_root_turns, (payload, chunk, depth, deadline, self.generation))
+            for chunk in chunks
+        ]
+        searched = 1
+        for task in tasks:
+            chunk_results, nodes = task.get()
+            self.nodes += nodes
+            results.extend(chunk_results)
+            searched += len(chunk_results)
+
+        # Mayor puntaje; en empate, primero los exactos y luego el orden de la raíz
+        index, value, _ = max(results, key=lambda r: (r[1], r[2], -r[0]))
+        return index, value, searched == len(turns)
+
+    # Mejor turno completo para el color del turno, igual que Searcher.get_best_move
+    def get_best_move(self, state, time_limit=None, depth=None):
+        if self.searcher is not None:
+            move = self.searcher.get_best_move(state, time_limit, depth)
+            self.nodes = self.searcher.nodes
+            return move
+        if time_limit is None:
+            time_limit = self.time_limit
+        if depth is None:
+            depth = MAX_DEPTH if time_limit is not None else self.depth
+        self.nodes = 0
+        self.generation += 1
+        deadline = time.time() + time_limit if time_limit is not None else None
+
+        payload = state_to_payload(state)
+        turns = generate_turns(state.board, state.turn, state.remaining_moves)
+        if not turns:
+            return None
+        best_move = None
+        for current_depth in range(1, depth + 1):
+            # En la primera iteración el primer turno no tiene límite, para tener una jugada
+            index, value, complete = self.search_root(payload, turns, current_depth, deadline, current_depth == 1)
+            if index is None:
+                break
+            best_move = turns[index]
+            # El mejor turno se busca primero en la siguiente iteración
+            turns.insert(0, turns.pop(index))
+            if not complete or abs(value) >= WIN_SCORE:
+                break
+            if deadline is not None and time.time() >= deadline:
+                break
+        return best_move
+
+
+# Búsqueda Lazy SMP: varios procesos profundizan sobre la misma posición y
+# comparten una tabla de transposición en memoria compartida. Los ayudantes
+# empiezan en otra profundidad y en otro orden de la raíz, de modo que llenan
+# la tabla con resultados que el proceso principal aprovecha.
+_smp_searcher = None
+_smp_generation = 0  # Última búsqueda (get_best_move) vista por el proceso
+
+
+def _init_smp_worker(tt_name, tt_size, evaluate, evaluate_color):
+    global _smp_searcher
+    table = SharedTranspositionTable(tt_size, name=tt_name)
+    _smp_searcher = Searcher(evaluate=evaluate, evaluate_color=evaluate_color, transposition_table=table)
+
+
+# Profundización iterativa de un ayudante. El ayudante 0 es el principal: empieza
+# en profundidad 1 y su primera iteración siempre termina. Los demás alternan la
+# profundidad inicial y rotan el orden de la raíz.
+# `deadline` es la hora de corte (time.time()), común a todos los ayudantes.
+# Con cada `generation` nueva el proceso también envejece su orden de movimientos.
+# Devuelve (turno, profundidad completa, nodos, [(profundidad, segundos)]).
+def _smp_search(payload, helper, generation, depth, deadline):
+    global _smp_generation
+    time_limit = max(0.0, deadline - time.time()) if deadline is not None else None
+    state = state_from_payload(payload)
+    searcher = _smp_searcher
+    searcher.transposition_table.generation = generation
+    if generation != _smp_generation:
+        _smp_generation = generation
+        if searcher.ordering is not None:
+            searcher.ordering.new_search()
+    searcher.root_rotation = helper * 7
+    best_move = None
+    for stats in searcher.iter_search(state, time_limit, depth, 1 + helper % 2, helper == 0):
+        best_move = stats.move
+    return best_move, searcher.completed_depth, searcher.nodes, searcher.depth_times
+
+
+class LazySMPSearcher:
+    # workers: número de procesos que buscan a la vez sobre la misma posición
+    def __init__(self, evaluate=evaluate_board, evaluate_color=None, depth=2,
+                 time_limit=None, workers=None, tt_size=1 << 18):
+        self.depth = depth
+        self.time_limit = time_limit
+        self.workers = workers if workers is not None else os.cpu_count() or 1
+        self.generation = 0
+        self.nodes = 0
+        self.completed_depth = 0
+        self.depth_times = []
+        self.transposition_table = SharedTranspositionTable(tt_size)
+        self.pool = multiprocessing.Pool(
+            self.workers, initializer=_init_smp_worker,
+            initargs=(self.transposition_table.name, tt_size, evaluate, evaluate_color),
+        )
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.terminate()
+            self.pool.join()
+            self.pool = None
+            self.transposition_table.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # Mejor turno completo para el color del turno. Se queda con el resultado del
+    # ayudante que llegó más hondo; en empate, con el del principal.
+    def get_best_move(self, state, time_limit=None, depth=None):
+        if time_limit is None:
+            time_limit = self.time_limit
+        if depth is None:
+            depth = MAX_DEPTH if time_limit is not None else self.depth
+        self.generation = (self.generation + 1) & 0xFF
+        deadline = time.time() + time_limit if time_limit is not None else None
+        payload = state_to_payload(state)
+        tasks = [
+            self.pool.apply_async(_smp_search, (payload, helper, self.generation, depth, deadline))
+            for helper in range(self.workers)
+        ]
+        results = [task.get() for task in tasks]
+        self.nodes = sum(result[2] for result in results)
+        best_move, self.completed_depth, _, self.depth_times = max(
+            (result for result in results if result[0] is not None),
+            key=lambda result: result[1],
+            default=(None, 0, 0, []),
+        )
+        return best_move
+
+
+# Medir nodos por segundo y tiempo hasta cada profundidad de Lazy SMP con
+# distintos números de procesos sobre la misma posición
+def measure_smp_scaling(state, worker_counts=(1, 2, 4, 8), time_limit=2.0, **searcher_options):
+    report = []
+    for workers in worker_counts:
+        with LazySMPSearcher(workers=workers, **searcher_options) as searcher:
+            start = time.perf_counter()
+            searcher.get_best_move(state.copy(), time_limit=time_limit)
+            elapsed = time.perf_counter() - start
+        report.append({
+            "workers": workers,
+            "nodes": searcher.nodes,
+            "seconds": elapsed,
+            "nodes_per_second": searcher.nodes / elapsed if elapsed else 0.0,
+            "completed_depth": searcher.completed_depth,
+            "time_to_depth": {depth: seconds for depth, seconds in searcher.depth_times},
+        })
+    return report
+
+
+if __name__ == "__main__":
+    import json
+    import sys
+
+    seed = int(sys.argv[1]) if len(sys.argv) > 1 else 0
+    print(json.dumps(measure_smp_scaling(GameState.new_game(seed)), indent=2))
@@ -0,0 +1,99 @@
+# Reglas del juego: estado de la partida, validación de pasos y trampas
+import random
+
+from .board import (
+    Board, GOLD, SILVER, COLS, RABBIT, TRAP_SQUARES, ROW_MASKS, NEIGHBOR_MASKS,
+)
+from .movegen import (
+    STEPS_PER_TURN, generate_moves, is_trapped, make_move, captured_pieces,
+)
+
+
+# Generar posiciones iniciales para un jugador (filas 0 y 1).
+# `rng` es un random.Random con semilla para obtener posiciones reproducibles;
+# por omisión se usa el módulo random global.
+def generate_random_positions(rng=random):
+    pieces = [
+        "E", "C", "H", "H", "D", "D", "G", "G",
+        "R", "R", "R", "R", "R", "R", "R", "R"
+    ]
+    rng.shuffle(pieces)
+    positions = []
+    available_slots = [(row, col) for row in range(2) for col in range(COLS)]
+    rng.shuffle(available_slots)
+
+    for piece in pieces:
+        x, y = available_slots.pop()
+        positions.append((x, y, piece))
+
+    return positions
+
+
+# Posiciones iniciales de ambos jugadores; plata ocupa las filas 6 y 7
+def generate_random_setup(rng=random):
+    return {
+        "gold": generate_random_positions(rng),
+        "silver": [(x + 6, y, piece) for x, y, piece in generate_random_positions(rng)]
+    }
+
+
+# Verificar si dos casillas son adyacentes
+def is_adjacent(sq1, sq2):
+    return NEIGHBOR_MASKS[sq1] >> sq2 & 1 == 1
+
+
+# Eliminar las piezas capturadas en las trampas; devuelve (casilla, código)
+def check_traps(board):
+    captured = []
+    for sq in TRAP_SQUARES:
+        if is_trapped(board, sq):
+            captured.append((sq, board.remove(sq)))
+    return captured
+
+
+# Ganador si hay un conejo en la fila final del rival, o None
+def winner(board):
+    if board.pieces_of(GOLD, RABBIT) & ROW_MASKS[7]:
+        return GOLD
+    if board.pieces_of(SILVER, RABBIT) & ROW_MASKS[0]:
+        return SILVER
+    return None
+
+
+# Estado de la partida: tablero, color que mueve y pasos restantes del turno
+class GameState:
+    __slots__ = ("board", "turn", "remaining_moves")
+
+    def __init__(self, board, turn=GOLD, remaining_moves=STEPS_PER_TURN):
+        self.board = board
+        self.turn = turn
+        self.remaining_moves = remaining_moves
+
+    # Nueva partida con posiciones iniciales aleatorias; con `seed` la
+    # posición es siempre la misma
+    @classmethod
+    def new_game(cls, seed=None):
+        rng = random if seed is None else random.Random(seed)
+        return cls(Board.from_positions(generate_random_setup(rng)))
+
+    def copy(self):
+        return GameState(self.board.copy(), self.turn, self.remaining_moves)
+
+    # Movimientos legales del color del turno con los pasos restantes
+    def legal_moves(self):
+        return generate_moves(self.board, self.turn, self.remaining_moves)
+
+    # Aplicar un movimiento (paso simple, empuje o jalón) y resolver las trampas;
+    # devuelve las piezas capturadas como (casilla, código)
+    def apply_move(self, move):
+        undo = make_move(self.board, move)
+        self.remaining_moves -= len(move)
+        return captured_pieces(undo)
+
+    # Pasar el turno al otro color
+    def end_turn(self):
+        self.turn = 1 - self.turn
+        self.remaining_moves = STEPS_PER_TURN
+
+    def winner(self):
+        return winner(self.board)
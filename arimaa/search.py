@@ -0,0 +1,735 @@
+# Búsqueda Minimax con poda alfa-beta y tabla de transposición.
+# Cada nivel del árbol es un turno completo de 1 a 4 pasos.
+import logging
+import threading
+import time
+
+from .board import GOLD, SILVER, ZOBRIST_SIDE, ZOBRIST_STEPS, square_coords
+from .evaluation import evaluate_board
+from .goal import goal_distance, goal_threat
+from .movegen import STEPS_PER_TURN, generate_moves, iter_turns, make_move, unmake_move
+from .ordering import MoveOrdering, capture_value
+from .rules import winner
+from .tt import TranspositionTable, EXACT, LOWER, NEGATED_BOUND, UPPER
+
+WIN_SCORE = 100000  # Puntaje de una partida ganada
+MAX_DEPTH = 64  # Límite de la profundización iterativa con tiempo
+TIME_CHECK_INTERVAL = 256  # Nodos entre consultas al reloj
+QUIESCENCE_BUDGET = 64  # Nodos de quiescencia por cada hoja
+NULL_WINDOW = 1  # Ancho de la ventana nula de PVS
+ASPIRATION_WINDOW = 2  # Semiancho de la ventana de aspiración por omisión
+NULL_MOVE_MIN_DEPTH = 2  # Profundidad restante mínima para probar el turno nulo
+NULL_MOVE_REDUCTION = 1  # Turnos que se restan además del turno cedido
+LMR_MIN_DEPTH = 2  # Profundidad restante mínima para reducir turnos tardíos
+LMR_MIN_MOVES = 6  # Turnos que se buscan completos antes de reducir
+LMR_REDUCTION = 1  # Turnos que se restan a un turno tardío tranquilo
+BATCH_MIN_SIZE = 8  # Hojas del primer lote de la evaluación por lotes
+BATCH_MAX_SIZE = 512
+
+logger = logging.getLogger(__name__)
+
+
+# Se lanza dentro de la búsqueda cuando se acaba el tiempo
+class SearchTimeout(Exception):
+    pass
+
+
+# Estadísticas de una iteración de la profundización. Los contadores se llenan
+# durante la búsqueda; nodes, elapsed, move y score al terminar la iteración.
+class SearchStats:
+    __slots__ = (
+        "depth", "nodes", "quiescence_nodes", "leaf_evals", "goal_stops",
+        "goal_extensions", "researches", "aspiration_failures", "null_cutoffs",
+        "reductions", "reduction_researches", "tt_probes", "tt_hits", "tt_cutoffs",
+        "expanded", "children", "cutoffs", "elapsed", "total_elapsed", "move",
+        "score", "complete", "effective_branching_factor",
+    )
+
+    def __init__(self, depth=0):
+        self.depth = depth
+        self.nodes = 0
+        self.quiescence_nodes = 0  # Incluidos en nodes
+        self.leaf_evals = 0
+        self.goal_stops = 0  # Nodos cortados porque quien mueve llega a la meta
+        self.goal_extensions = 0  # Hojas extendidas por una amenaza de meta rival
+        self.researches = 0  # Búsquedas de PVS repetidas con la ventana completa
+        self.aspiration_failures = 0  # Iteraciones repetidas fuera de la ventana
+        self.null_cutoffs = 0  # Podas por turno nulo
+        self.reductions = 0  # Turnos tardíos buscados con menos profundidad
+        self.reduction_researches = 0  # Turnos reducidos que hubo que repetir
+        self.tt_probes = 0
+        self.tt_hits = 0
+        self.tt_cutoffs = 0
+        self.expanded = 0  # Nodos cuyos turnos se recorrieron
+        self.children = 0  # Turnos buscados en esos nodos
+        self.cutoffs = [0] * (MAX_DEPTH + 1)  # Podas beta por profundidad restante
+        self.elapsed = 0.0  # Segundos de esta iteración
+        self.total_elapsed = 0.0  # Segundos desde el inicio de la búsqueda
+        self.move = None
+        self.score = None
+        self.complete = True  # False si se cortó por tiempo tras el primer turno
+        self.effective_branching_factor = None  # Nodos de esta iteración / anterior
+
+    @property
+    def tt_hit_rate(self):
+        return self.tt_hits / self.tt_probes if self.tt_probes else 0.0
+
+    # Turnos buscados en promedio por cada nodo expandido
+    @property
+    def branching_factor(self):
+        return self.children / self.expanded if self.expanded else 0.0
+
+    @property
+    def nodes_per_second(self):
+        return self.nodes / self.elapsed if self.elapsed else 0.0
+
+    # Copia serializable (p. ej. para JSON)
+    def as_dict(self):
+        return {
+            "depth": self.depth,
+            "nodes": self.nodes,
+            "quiescence_nodes": self.quiescence_nodes,
+            "leaf_evals": self.leaf_evals,
+            "goal_stops": self.goal_stops,
+            "goal_extensions": self.goal_extensions,
+            "researches": self.researches,
+            "aspiration_failures": self.aspiration_failures,
+            "null_cutoffs": self.null_cutoffs,
+            "reductions": self.reductions,
+            "reduction_researches": self.reduction_researches,
+            "tt_probes": self.tt_probes,
+            "tt_hits": self.tt_hits,
+            "tt_hit_rate": self.tt_hit_rate,
+            "tt_cutoffs": self.tt_cutoffs,
+            "beta_cutoffs": {str(d): n for d, n in enumerate(self.cutoffs) if n},
+            "branching_factor": self.branching_factor,
+            "effective_branching_factor": self.effective_branching_factor,
+            "seconds": self.elapsed,
+            "total_seconds": self.total_elapsed,
+            "nodes_per_second": self.nodes_per_second,
+            "complete": self.complete,
+            "score": self.score,
+            "move": [list(step) for step in self.move] if self.move else None,
+        }
+
+
+# Callback para on_iteration que manda cada iteración al logger del módulo.
+# No imprime nada mientras no se configure logging con nivel DEBUG.
+def log_iteration(stats):
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "profundidad %d: %s puntaje %s, %d nodos, %.2fs, TT %.0f%%, ramificación %.1f",
+            stats.depth, format_move(stats.move), stats.score, stats.nodes,
+            stats.elapsed, 100 * stats.tt_hit_rate, stats.branching_factor,
+        )
+
+
+# Movimientos tácticos para la quiescencia: los que capturan una pieza rival en
+# una trampa, primero las capturas más valiosas. Las metas de un conejo las
+# detecta goal_distance en cada nodo.
+def tactical_moves(board, color, steps_left):
+    scored = []
+    for move in generate_moves(board, color, steps_left):
+        if len(move) == 2:
+            value = capture_value(board, color, move)
+            if value:
+                scored.append((value, move))
+    scored.sort(key=lambda item: item[0], reverse=True)
+    return [move for _, move in scored]
+
+
+# Recorrer los turnos de un color empezando por el sugerido por la tabla de
+# transposición; `order` ordena los movimientos de cada paso del resto.
+# Igual que en iter_turns, mientras se procesa cada turno el tablero queda en
+# su posición final.
+def ordered_turns(board, color, steps_left, first_turn, order=None):
+    skip = None
+    if first_turn is not None and len(first_turn) <= steps_left:
+        undo = make_move(board, first_turn)
+        skip = board.hash
+        try:
+            yield first_turn
+        finally:
+            unmake_move(board, undo)
+    turns = iter_turns(board, color, steps_left, order)
+    try:
+        for turn in turns:
+            if board.hash != skip:
+                yield turn
+    finally:
+        turns.close()
+
+
+# Igual que ordered_turns, pero rota los turnos que siguen al primero.
+# Necesita la lista completa, así que vuelve a aplicar cada turno.
+def rotated_turns(board, turns, rotation):
+    try:
+        first = next(turns, None)
+        rest = list(turns)
+    finally:
+        turns.close()
+    if first is None:
+        return
+    if rest:
+        offset = rotation % len(rest)
+        rest = rest[offset:] + rest[:offset]
+    for turn in [first] + rest:
+        undo = make_move(board, turn)
+        try:
+            yield turn
+        finally:
+            unmake_move(board, undo)
+
+
+# Texto de un movimiento en coordenadas (fila, columna)
+def format_move(move):
+    return " ".join(f"{square_coords(start)}->{square_coords(end)}" for start, end in move)
+
+
+# Clave de la tabla de transposición: posición, color que mueve y, en una raíz
+# a mitad de turno, pasos que quedan. Así el puntaje de esa raíz no pasa por
+# el de un turno completo en minimax.
+def position_key(board, color, steps_left=STEPS_PER_TURN):
+    key = board.hash ^ ZOBRIST_SIDE if color == SILVER else board.hash
+    if steps_left != STEPS_PER_TURN:
+        key ^= ZOBRIST_STEPS[steps_left]
+    return key
+
+
+class Searcher:
+    # evaluate: heurística del tablero (una función o un Evaluator del registro)
+    # evaluate_color: color al que favorecen los puntajes positivos de evaluate;
+    # por omisión el del Evaluator, u oro
+    # depth: número de turnos completos que se buscan, contando el de la raíz
+    # time_limit: segundos por jugada; si se da, se profundiza hasta agotarlos
+    # transposition_table: tabla a usar en lugar de una propia (p. ej. compartida)
+    # root_rotation: desplaza el orden de los turnos de la raíz después del
+    # primero, para que varios procesos no busquen en el mismo orden
+    # on_iteration: función que recibe las SearchStats de cada iteración
+    # move_ordering: ordenar capturas, asesinos e historia (False: orden del generador)
+    # quiescence_budget: nodos de quiescencia por hoja (0 la desactiva)
+    # pvs: búsqueda de variante principal (ventana nula para los turnos que
+    # siguen al primero); False usa alfa-beta con la ventana completa
+    # aspiration_window: semiancho de la ventana de la raíz alrededor del
+    # puntaje de la iteración anterior; None la desactiva
+    # null_move: podar si aun cediendo el turno el rival no alcanza la cota,
+    # desde null_move_min_depth turnos restantes y con null_move_reduction
+    # turnos menos (None desactiva la poda)
+    # lmr: reducir en lmr_reduction turnos los turnos sin capturas que siguen a
+    # los primeros lmr_min_moves, desde lmr_min_depth turnos restantes (None
+    # desactiva la reducción)
+    # batch_evaluate: evaluación por lotes (ver features.batch_evaluator) con la
+    # misma convención de signo que evaluate; si se da, las hojas hermanas se
+    # evalúan juntas en lugar de una por una y sin quiescencia
+    def __init__(self, evaluate=evaluate_board, evaluate_color=None, depth=2,
+                 time_limit=None, tt_size=1 << 18, transposition_table=None,
+                 root_rotation=0, on_iteration=None, move_ordering=True,
+                 quiescence_budget=QUIESCENCE_BUDGET, pvs=True,
+                 aspiration_window=ASPIRATION_WINDOW,
+                 null_move_min_depth=NULL_MOVE_MIN_DEPTH,
+                 null_move_reduction=NULL_MOVE_REDUCTION,
+                 lmr_min_depth=LMR_MIN_DEPTH, lmr_min_moves=LMR_MIN_MOVES,
+                 lmr_reduction=LMR_REDUCTION, batch_evaluate=None):
+        if evaluate_color is None:
+            evaluate_color = getattr(evaluate, "color", GOLD)
+        self.evaluate = evaluate
+        self.evaluate_color = evaluate_color
+        self.depth = depth
+        self.time_limit = time_limit
+        self.root_rotation = root_rotation
+        self.on_iteration = on_iteration
+        self.ordering = MoveOrdering() if move_ordering else None
+        self.quiescence_budget = quiescence_budget
+        self.quiescence_left = 0
+        self.pvs = pvs
+        self.aspiration_window = aspiration_window
+        self.null_move_min_depth = null_move_min_depth
+        self.null_move_reduction = null_move_reduction
+        self.lmr_min_depth = lmr_min_depth
+        self.lmr_min_moves = lmr_min_moves
+        self.lmr_reduction = lmr_reduction
+        self.batch_evaluate = batch_evaluate
+        # La tabla se conserva entre llamadas para reutilizar los turnos anteriores
+        if transposition_table is None:
+            transposition_table = TranspositionTable(tt_size)
+        self.transposition_table = transposition_table
+        self.deadline = None
+        self.stopped = False  # Pedido de stop() para la búsqueda en curso
+        self.first_turn_untimed = False  # El primer turno de la raíz se busca sin límite
+        self.untimed_turn = False  # Ese primer turno está en curso; stop() no lo corta
+        self.stop_lock = threading.Lock()  # Entre stop() y el cambio de deadline
+        self.nodes = 0
+        self.completed_depth = 0
+        self.depth_times = []  # (profundidad, segundos) de cada iteración completa
+        self.stats = SearchStats()  # Iteración en curso
+        self.iterations = []  # SearchStats de las iteraciones de la última búsqueda
+
+    # Puntaje del tablero desde el punto de vista de un color
+    def score(self, board, color):
+        value = self.evaluate(board)
+        return value if color == self.evaluate_color else -value
+
+    # Algoritmo Minimax sobre turnos completos. `color` es quien mueve en este
+    # nivel; el jugador que maximiza es el color de la raíz; `ply` es la
+    # distancia a la raíz. Si quien mueve llega a la meta en este turno el nodo
+    # se da por ganado sin buscar; si en una hoja el rival amenaza llegar, se
+    # extiende un turno más (una sola vez por rama, según `extended`).
+    # `allow_null` es False justo después de un turno nulo.
+    def minimax(self, board, color, depth, alpha, beta, maximizing_player, ply=1,
+                extended=False, allow_null=True):
+        self.nodes += 1
+        if (self.deadline is not None and self.nodes % TIME_CHECK_INTERVAL == 0
+                and time.perf_counter() > self.deadline):
+            raise SearchTimeout()
+
+        stats = self.stats
+        root_color = color if maximizing_player else 1 - color
+        goal = winner(board)
+        if goal is not None:
+            return WIN_SCORE if goal == root_color else -WIN_SCORE
+        if goal_threat(board, color):
+            stats.goal_stops += 1
+            return WIN_SCORE if maximizing_player else -WIN_SCORE
+        if depth == 0 and not extended and goal_threat(board, 1 - color):
+            stats.goal_extensions += 1
+            depth = 1
+            extended = True
+        if depth == 0:
+            if self.quiescence_budget:
+                self.quiescence_left = self.quiescence_budget
+                return self.quiescence(board, color, STEPS_PER_TURN, alpha, beta, maximizing_player)
+            stats.leaf_evals += 1
+            return self.score(board, root_color)
+
+        tt = self.transposition_table
+        key = position_key(board, color)
+        entry = tt.probe(key)
+        stats.tt_probes += 1
+        tt_move = None
+        if entry is not None:
+            stats.tt_hits += 1
+            _, entry_depth, bound, score, tt_move, _ = entry
+            if not maximizing_player:
+                # La tabla guarda el puntaje para quien mueve, no para la raíz
+                score = -score
+                bound = NEGATED_BOUND[bound]
+            if entry_depth >= depth:
+                if bound == EXACT:
+                    stats.tt_cutoffs += 1
+                    return score
+                if bound == LOWER:
+                    alpha = max(alpha, score)
+                else:
+                    beta = min(beta, score)
+                if beta <= alpha:
+                    stats.tt_cutoffs += 1
+                    return score
+
+        # Turno nulo: en Arimaa se pueden ceder los pasos que quedan. Si aun sin
+        # mover el rival no baja de la cota con una búsqueda reducida, se poda.
+        null_depth = self.null_move_min_depth
+        if allow_null and null_depth is not None and depth >= null_depth:
+            reduced = max(depth - 1 - self.null_move_reduction, 0)
+            if maximizing_player and beta != float('inf'):
+                value = self.minimax(board, 1 - color, reduced, beta - NULL_WINDOW, beta, False, ply + 1, extended, False)
+                if value >= beta:
+                    stats.null_cutoffs += 1
+                    return value
+            elif not maximizing_player and alpha != float('-inf'):
+                value = self.minimax(board, 1 - color, reduced, alpha, alpha + NULL_WINDOW, True, ply + 1, extended, False)
+                if value <= alpha:
+                    stats.null_cutoffs += 1
+                    return value
+
+        alpha_orig, beta_orig = alpha, beta
+        best_move = None
+        best_eval = float('-inf') if maximizing_player else float('inf')
+        searched = 0
+        material = board.material[0] + board.material[1]
+        lmr_depth = self.lmr_min_depth
+        lmr = lmr_depth is not None and depth >= lmr_depth
+        pvs = self.pvs
+        ordering = self.ordering
+        order = ordering.order_for(ply) if ordering is not None else None
+        if depth == 1 and self.batch_evaluate is not None:
+            best_move, best_eval, searched = self.batch_leaves(
+                board, color, alpha, beta, maximizing_player, tt_move, order, ply, extended,
+            )
+        else:
+            turns = ordered_turns(board, color, STEPS_PER_TURN, tt_move, order)
+            try:
+                for turn in turns:
+                    searched += 1
+                    eval = None
+                    # Turnos tardíos sin capturas: primero una búsqueda reducida con
+                    # ventana nula; solo si mejora la cota se busca completo
+                    if (lmr and searched > self.lmr_min_moves
+                            and board.material[0] + board.material[1] == material):
+                        stats.reductions += 1
+                        reduced = max(depth - 1 - self.lmr_reduction, 0)
+                        if maximizing_player:
+                            eval = self.minimax(board, 1 - color, reduced, alpha, alpha + NULL_WINDOW, False, ply + 1, extended)
+                            if eval > alpha:
+                                eval = None
+                        else:
+                            eval = self.minimax(board, 1 - color, reduced, beta - NULL_WINDOW, beta, True, ply + 1, extended)
+                            if eval < beta:
+                                eval = None
+                        if eval is None:
+                            stats.reduction_researches += 1
+                    if eval is None and (searched == 1 or not pvs):
+                        eval = self.minimax(board, 1 - color, depth - 1, alpha, beta, not maximizing_player, ply + 1, extended)
+                    elif eval is None:
+                        # Ventana nula: solo se comprueba si el turno mejora al mejor
+                        if maximizing_player:
+                            eval = self.minimax(board, 1 - color, depth - 1, alpha, alpha + NULL_WINDOW, False, ply + 1, extended)
+                        else:
+                            eval = self.minimax(board, 1 - color, depth - 1, beta - NULL_WINDOW, beta, True, ply + 1, extended)
+                        if alpha < eval < beta:
+                            stats.researches += 1
+                            eval = self.minimax(board, 1 - color, depth - 1, alpha, beta, not maximizing_player, ply + 1, extended)
+                    if maximizing_player:
+                        if eval > best_eval:
+                            best_eval = eval
+                            best_move = turn
+                        alpha = max(alpha, eval)
+                    else:
+                        if eval < best_eval:
+                            best_eval = eval
+                            best_move = turn
+                        beta = min(beta, eval)
+                    if beta <= alpha:
+                        stats.cutoffs[depth] += 1
+                        if ordering is not None:
+                            ordering.record_cutoff(color, turn, ply, depth)
+                        break
+            finally:
+                turns.close()
+        stats.expanded += 1
+        stats.children += searched
+
+        if best_move is None:
+            # Sin turnos legales el jugador pierde
+            return -WIN_SCORE if maximizing_player else WIN_SCORE
+
+        if best_eval <= alpha_orig:
+            bound = UPPER
+        elif best_eval >= beta_orig:
+            bound = LOWER
+        else:
+            bound = EXACT
+        if maximizing_player:
+            tt.store(key, depth, bound, best_eval, best_move)
+        else:
+            tt.store(key, depth, NEGATED_BOUND[bound], -best_eval, best_move)
+        return best_eval
+
+    # Último nivel con evaluación por lotes: las casillas de las hojas se
+    # juntan y se evalúan en una sola llamada. Los lotes empiezan con
+    # BATCH_MIN_SIZE hojas y se duplican, para no perder las podas que suelen
+    # llegar con los primeros turnos. Las hojas con meta o amenaza de meta
+    # siguen por minimax, con el `extended` de la rama para no extender dos
+    # veces. Devuelve (mejor turno, puntaje, turnos recorridos).
+    def batch_leaves(self, board, color, alpha, beta, maximizing_player, tt_move, order, ply, extended):
+        stats = self.stats
+        sign = 1 if (color if maximizing_player else 1 - color) == self.evaluate_color else -1
+        best_move = None
+        best_eval = float('-inf') if maximizing_player else float('inf')
+        leaf_turns = []
+        leaf_squares = []
+        batch_size = BATCH_MIN_SIZE
+        searched = 0
+        turns = ordered_turns(board, color, STEPS_PER_TURN, tt_move, order)
+        try:
+            for turn in turns:
+                searched += 1
+                if (winner(board) is not None or goal_threat(board, 1 - color)
+                        or goal_threat(board, color)):
+                    # Las hojas pendientes van primero, en el orden de los
+                    # turnos: si ya podan, esta no hace falta buscarla
+                    evals = self._evaluate_leaves(leaf_turns, leaf_squares, sign) + [(turn, None)]
+                    leaf_turns, leaf_squares = [], []
+                else:
+                    leaf_turns.append(turn)
+                    leaf_squares.append(board.squares[:])
+                    if len(leaf_turns) < batch_size:
+                        continue
+                    evals = self._evaluate_leaves(leaf_turns, leaf_squares, sign)
+                    leaf_turns, leaf_squares = [], []
+                    batch_size = min(batch_size * 2, BATCH_MAX_SIZE)
+                for leaf, eval in evals:
+                    if eval is None:
+                        eval = self.minimax(
+                            board, 1 - color, 0, alpha, beta, not maximizing_player, ply + 1, extended,
+                        )
+                    if eval > best_eval if maximizing_player else eval < best_eval:
+                        best_eval = eval
+                        best_move = leaf
+                    if maximizing_player:
+                        alpha = max(alpha, best_eval)
+                    else:
+                        beta = min(beta, best_eval)
+                    if beta <= alpha:
+                        break
+                if beta <= alpha:
+                    stats.cutoffs[1] += 1
+                    if self.ordering is not None:
+                        self.ordering.record_cutoff(color, best_move, ply, 1)
+                    break
+            else:
+                for leaf, eval in self._evaluate_leaves(leaf_turns, leaf_squares, sign):
+                    if eval > best_eval if maximizing_player else eval < best_eval:
+                        best_eval = eval
+                        best_move = leaf
+        finally:
+            turns.close()
+        return best_move, best_eval, searched
+
+    # Evaluar un lote de hojas; devuelve [(turno, puntaje para la raíz)]
+    def _evaluate_leaves(self, leaf_turns, leaf_squares, sign):
+        if not leaf_turns:
+            return []
+        self.nodes += len(leaf_turns)
+        self.stats.leaf_evals += len(leaf_turns)
+        if self.deadline is not None and time.perf_counter() > self.deadline:
+            raise SearchTimeout()
+        values = self.batch_evaluate(leaf_squares)
+        return [(turn, sign * float(value)) for turn, value in zip(leaf_turns, values)]
+
+    # Búsqueda de quiescencia en las hojas: solo se prueban movimientos tácticos,
+    # paso a paso. Al empezar un turno el jugador puede quedarse con la
+    # evaluación estática; a mitad de turno puede cederlo al rival, que a su vez
+    # prueba sus capturas y amenazas de meta. Se detiene al agotar el presupuesto.
+    def quiescence(self, board, color, steps_left, alpha, beta, maximizing_player):
+        self.nodes += 1
+        if (self.deadline is not None and self.nodes % TIME_CHECK_INTERVAL == 0
+                and time.perf_counter() > self.deadline):
+            raise SearchTimeout()
+        stats = self.stats
+        stats.quiescence_nodes += 1
+        self.quiescence_left -= 1
+
+        root_color = color if maximizing_player else 1 - color
+        goal = winner(board)
+        if goal is not None:
+            return WIN_SCORE if goal == root_color else -WIN_SCORE
+        if steps_left and goal_distance(board, color, steps_left) is not None:
+            return WIN_SCORE if maximizing_player else -WIN_SCORE
+        if steps_left == STEPS_PER_TURN or self.quiescence_left <= 0:
+            stats.leaf_evals += 1
+            best_eval = self.score(board, root_color)
+        else:
+            best_eval = self.quiescence(board, 1 - color, STEPS_PER_TURN, alpha, beta, not maximizing_player)
+        if self.quiescence_left <= 0:
+            return best_eval
+        if maximizing_player:
+            if best_eval >= beta:
+                return best_eval
+            alpha = max(alpha, best_eval)
+        else:
+            if best_eval <= alpha:
+                return best_eval
+            beta = min(beta, best_eval)
+
+        for move in tactical_moves(board, color, steps_left):
+            undo = make_move(board, move)
+            try:
+                eval = self.quiescence(board, color, steps_left - len(move), alpha, beta, maximizing_player)
+            finally:
+                unmake_move(board, undo)
+            if maximizing_player:
+                best_eval = max(best_eval, eval)
+                alpha = max(alpha, eval)
+            else:
+                best_eval = min(best_eval, eval)
+                beta = min(beta, eval)
+            if beta <= alpha or self.quiescence_left <= 0:
+                break
+        return best_eval
+
+    # Buscar la raíz a una profundidad fija dentro de la ventana (alpha, beta);
+    # devuelve (turno, puntaje). Un puntaje <= alpha o >= beta es solo una cota.
+    # Si se acaba el tiempo después de buscar completo el primer turno (el mejor
+    # de la iteración anterior), devuelve lo mejor encontrado hasta ese momento;
+    # ese resultado parcial no se guarda en la tabla de transposición.
+    def search_root(self, state, depth, alpha=float('-inf'), beta=float('inf')):
+        board = state.board
+        color = state.turn
+        tt = self.transposition_table
+        key = position_key(board, color, state.remaining_moves)
+        entry = tt.probe(key)
+        best_move = None
+        best_value = float('-inf')
+        order = self.ordering.order_for(0) if self.ordering is not None else None
+        turns = ordered_turns(board, color, state.remaining_moves, entry[4] if entry else None, order)
+        if self.root_rotation:
+            turns = rotated_turns(board, turns, self.root_rotation)
+        searched = 0
+        cut = False
+        try:
+            for turn in turns:
+                searched += 1
+                low = max(alpha, best_value)
+                try:
+                    if searched == 1 and self.first_turn_untimed:
+                        # Sin ningún turno todavía: el primero se termina siempre
+                        with self.stop_lock:
+                            deadline, self.deadline = self.deadline, None
+                            self.untimed_turn = True
+                        try:
+                            move_value = self.minimax(board, 1 - color, depth - 1, low, beta, False)
+                        finally:
+                            with self.stop_lock:
+                                self.untimed_turn = False
+                                self.deadline = 0 if self.stopped else deadline
+                    elif searched == 1 or not self.pvs:
+                        move_value = self.minimax(board, 1 - color, depth - 1, low, beta, False)
+                    else:
+                        move_value = self.minimax(board, 1 - color, depth - 1, low, low + NULL_WINDOW, False)
+                        if low < move_value < beta:
+                            self.stats.researches += 1
+                            move_value = self.minimax(board, 1 - color, depth - 1, low, beta, False)
+                except SearchTimeout:
+                    if best_move is None:
+                        raise
+                    self.stats.complete = False
+                    cut = True
+                    break
+                if move_value > best_value:
+                    best_value = move_value
+                    best_move = turn
+                if best_value >= beta:
+                    break
+        finally:
+            turns.close()
+        self.stats.expanded += 1
+        self.stats.children += searched
+        if best_move is not None and not cut:
+            if best_value <= alpha:
+                bound = UPPER
+            elif best_value >= beta:
+                bound = LOWER
+            else:
+                bound = EXACT
+            # En la raíz mueve el color de la raíz: el puntaje no cambia de signo
+            tt.store(key, depth, bound, best_value, best_move)
+        return best_move, best_value
+
+    # Buscar la raíz con una ventana de aspiración alrededor del puntaje de la
+    # última iteración de la misma paridad: con turnos completos, el puntaje
+    # cambia mucho según quién juega el último turno. Si el resultado cae fuera
+    # de la ventana, se repite con la ventana completa.
+    def search_root_window(self, state, depth):
+        window = self.aspiration_window
+        previous = None
+        for stats in self.iterations:
+            if stats.depth == depth - 2:
+                previous = stats.score
+        if window is None or previous is None or abs(previous) >= WIN_SCORE:
+            return self.search_root(state, depth)
+        alpha, beta = previous - window, previous + window
+        move, value = self.search_root(state, depth, alpha, beta)
+        if move is not None and alpha < value < beta:
+            return move, value
+        self.stats.aspiration_failures += 1
+        self.stats.complete = True
+        return self.search_root(state, depth)
+
+    # Variante principal guardada en la tabla de transposición a partir de la raíz
+    def principal_variation(self, state, max_length=MAX_DEPTH):
+        board = state.board
+        color = state.turn
+        steps_left = state.remaining_moves
+        variation = []
+        undos = []
+        seen = set()
+        while len(variation) < max_length:
+            key = position_key(board, color, steps_left)
+            entry = self.transposition_table.probe(key)
+            if entry is None or entry[4] is None or key in seen or len(entry[4]) > steps_left:
+                break
+            seen.add(key)
+            variation.append(entry[4])
+            undos.append(make_move(board, entry[4]))
+            color = 1 - color
+            steps_left = STEPS_PER_TURN
+        for undo in reversed(undos):
+            unmake_move(board, undo)
+        return variation
+
+    # Profundización iterativa como iterador: entrega las SearchStats de cada
+    # iteración útil (con su turno y puntaje) y se las pasa a on_iteration.
+    # El límite de tiempo rige desde la primera iteración; con first_complete
+    # el primer turno de la raíz de esa iteración se busca completo, para tener
+    # siempre una jugada. La tabla de transposición no se envejece aquí.
+    def iter_search(self, state, time_limit=None, depth=None, start_depth=1, first_complete=True):
+        if time_limit is None:
+            time_limit = self.time_limit
+        if depth is None:
+            depth = MAX_DEPTH if time_limit is not None else self.depth
+        self.nodes = 0
+        self.completed_depth = 0
+        self.depth_times = []
+        self.iterations = []
+        start = time.perf_counter()
+        deadline = start + time_limit if time_limit is not None else None
+        try:
+            for current_depth in range(start_depth, depth + 1):
+                self.first_turn_untimed = first_complete and current_depth == start_depth
+                self.deadline = deadline
+                if self.stopped:
+                    break
+                stats = self.stats = SearchStats(current_depth)
+                nodes = self.nodes
+                iteration_start = time.perf_counter()
+                try:
+                    move, value = self.search_root_window(state, current_depth)
+                except SearchTimeout:
+                    break
+                if move is None:
+                    break
+                now = time.perf_counter()
+                stats.nodes = self.nodes - nodes
+                stats.elapsed = now - iteration_start
+                stats.total_elapsed = now - start
+                stats.move = move
+                stats.score = value
+                if self.iterations and self.iterations[-1].nodes:
+                    stats.effective_branching_factor = stats.nodes / self.iterations[-1].nodes
+                self.iterations.append(stats)
+                self.completed_depth = current_depth
+                self.depth_times.append((current_depth, stats.total_elapsed))
+                if self.on_iteration is not None:
+                    self.on_iteration(stats)
+                yield stats
+                if abs(value) >= WIN_SCORE:
+                    break
+                if deadline is not None and time.perf_counter() >= deadline:
+                    break
+        finally:
+            self.deadline = None
+            self.stopped = False
+            self.first_turn_untimed = False
+
+    # Cortar desde otro hilo la búsqueda en curso: la iteración actual termina
+    # con SearchTimeout y no se empieza otra. Si está en curso el primer turno
+    # que first_complete protege, el corte llega cuando ese turno termina.
+    def stop(self):
+        with self.stop_lock:
+            self.stopped = True
+            if not self.untimed_turn:
+                self.deadline = 0
+
+    # Obtener el mejor turno completo (tupla de pasos) para el color del turno,
+    # limitado a los pasos que le quedan. Con límite de tiempo se profundiza
+    # iterativamente y se devuelve el resultado de la última iteración útil;
+    # cada iteración empieza por la variante principal de la anterior, que
+    # queda guardada en la tabla de transposición.
+    def get_best_move(self, state, time_limit=None, depth=None):
+        self.transposition_table.new_search()
+        if self.ordering is not None:
+            self.ordering.new_search()
+        best_move = None
+        for stats in self.iter_search(state, time_limit, depth):
+            best_move = stats.move
+        return best_move
@@ -0,0 +1,161 @@
+# Tabla de transposición de tamaño fijo para la búsqueda
+import struct
+
+# Tipos de cota guardados junto al puntaje
+EXACT, LOWER, UPPER = 0, 1, 2
+# Cota equivalente al cambiar el signo del puntaje, indexada por la cota
+NEGATED_BOUND = (EXACT, UPPER, LOWER)
+
+# Campos de cada entrada
+KEY, DEPTH, BOUND, SCORE, BEST, GENERATION = range(6)
+
+
+# Los puntajes se guardan desde el punto de vista del color que mueve en la
+# posición, así que una misma tabla sirve para búsquedas con cualquier raíz.
+class TranspositionTable:
+    def __init__(self, size=1 << 16):
+        # El tamaño se redondea a una potencia de dos para indexar con una máscara
+        self.size = 1 << max(0, size - 1).bit_length()
+        self.mask = self.size - 1
+        self.entries = [None] * self.size
+        self.generation = 0
+
+    # Marcar el inicio de una nueva búsqueda para envejecer las entradas viejas
+    def new_search(self):
+        self.generation += 1
+
+    def clear(self):
+        self.entries = [None] * self.size
+        self.generation = 0
+
+    # Buscar la entrada de una clave; devuelve None si no está
+    def probe(self, key):
+        entry = self.entries[key & self.mask]
+        if entry is not None and entry[KEY] == key:
+            return entry
+        return None
+
+    # Guardar un resultado. Se reemplaza la entrada existente si es de la misma
+    # posición, de una búsqueda anterior o de menor profundidad.
+    def store(self, key, depth, bound, score, best):
+        index = key & self.mask
+        old = self.entries[index]
+        if old is not None:
+            if old[KEY] == key:
+                if best is None:
+                    best = old[BEST]
+            elif old[GENERATION] == self.generation and old[DEPTH] > depth:
+                return
+        self.entries[index] = (key, depth, bound, score, best, self.generation)
+
+    def __len__(self):
+        return sum(1 for entry in self.entries if entry is not None)
+
+
+# Codificar un turno (hasta 4 pasos) en un entero: 3 bits de largo y 12 bits
+# por paso (casilla inicial y final)
+def encode_move(move):
+    if move is None:
+        return 0
+    code = len(move)
+    for i, (start, end) in enumerate(move):
+        code |= (start << 6 | end) << (3 + 12 * i)
+    return code
+
+
+def decode_move(code):
+    length = code & 7
+    if not length:
+        return None
+    return tuple(
+        (code >> (9 + 12 * i) & 63, code >> (3 + 12 * i) & 63)
+        for i in range(length)
+    )
+
+
+# Campos de cada registro de la tabla compartida (palabras de 64 bits)
+RECORD_WORDS = 4  # verificación, movimiento, profundidad/cota/generación, puntaje
+_MASK64 = (1 << 64) - 1
+
+
+# Tabla de transposición en memoria compartida entre procesos, como un arreglo
+# de registros de ancho fijo. No usa cerrojos: cada registro guarda la clave
+# combinada por XOR con el resto de sus palabras, así que un registro escrito a
+# medias por dos procesos a la vez no coincide con ninguna clave y se descarta.
+class SharedTranspositionTable:
+    def __init__(self, size=1 << 16, name=None):
+        from multiprocessing import shared_memory
+
+        self.size = 1 << max(0, size - 1).bit_length()
+        self.mask = self.size - 1
+        self.generation = 0
+        self.owner = name is None
+        if self.owner:
+            self.memory = shared_memory.SharedMemory(create=True, size=self.size * RECORD_WORDS * 8)
+        else:
+            self.memory = shared_memory.SharedMemory(name=name)
+        self.words = self.memory.buf.cast('Q')
+        if self.owner:
+            self.clear()
+
+    @property
+    def name(self):
+        return self.memory.name
+
+    # Liberar la memoria; el proceso que la creó también la elimina
+    def close(self):
+        self.words.release()
+        self.memory.close()
+        if self.owner:
+            self.memory.unlink()
+
+    def new_search(self):
+        self.generation = (self.generation + 1) & 0xFF
+
+    def clear(self):
+        size = self.size * RECORD_WORDS * 8
+        self.memory.buf[:size] = bytes(size)
+        self.generation = 0
+
+    def probe(self, key):
+        base = (key & self.mask) * RECORD_WORDS
+        words = self.words
+        check, move, meta, score_bits = words[base], words[base + 1], words[base + 2], words[base + 3]
+        if check ^ move ^ meta ^ score_bits != key:
+            return None
+        score = struct.unpack('<d', struct.pack('<Q', score_bits))[0]
+        return (key, meta & 0xFF, meta >> 8 & 3, score, decode_move(move), meta >> 10 & 0xFF)
+
+    # Misma política de reemplazo que TranspositionTable
+    def store(self, key, depth, bound, score, best):
+        old = self.probe_slot(key)
+        if old is not None:
+            if old[KEY] == key:
+                if best is None:
+                    best = old[BEST]
+            elif old[GENERATION] == self.generation and old[DEPTH] > depth:
+                return
+        move = encode_move(best)
+        meta = min(depth, 0xFF) | bound << 8 | self.generation << 10
+        score_bits = struct.unpack('<Q', struct.pack('<d', score))[0]
+        base = (key & self.mask) * RECORD_WORDS
+        words = self.words
+        words[base + 1] = move
+        words[base + 2] = meta
+        words[base + 3] = score_bits
+        words[base] = (key ^ move ^ meta ^ score_bits) & _MASK64
+
+    # Registro válido que ocupa la casilla de una clave, sea cual sea su clave
+    def probe_slot(self, key):
+        base = (key & self.mask) * RECORD_WORDS
+        words = self.words
+        check, move, meta, score_bits = words[base], words[base + 1], words[base + 2], words[base + 3]
+        if not check and not meta:
+            return None
+        stored_key = check ^ move ^ meta ^ score_bits
+        if stored_key & self.mask != key & self.mask:
+            return None  # Registro roto por escrituras simultáneas
+        return self.probe(stored_key)
+
+    def __len__(self):
+        return sum(1 for i in range(0, len(self.words), RECORD_WORDS) if self.words[i])
@@ -0,0 +1,240 @@
+# Ajuste automático de los pesos de las heurísticas a partir de partidas
+# (método de Texel): se busca que sigmoide(K * puntaje) prediga el resultado
+# de la partida en cada posición, minimizando el error cuadrático con
+# descenso por gradiente en lotes de NumPy.
+#
+# Los registros son archivos de texto (o .gz) con una posición por línea:
+#   <64 casillas> <resultado>
+# Las casillas van fila por fila como en repr(Board): "." vacía, mayúsculas
+# oro y minúsculas plata. El resultado es desde el punto de vista de oro:
+# 1 gana oro, 0 gana plata, 0.5 tablas. El archivo se lee en bloques de
+# chunk_size posiciones, así que la memoria no depende de su largo.
+#
+# Uso:
+#   python -m arimaa.tuning selfplay --games 200 --output partidas.txt
+#   python -m arimaa.tuning tune partidas.txt --evaluator board
+import argparse
+import gzip
+import random
+
+from . import features
+from .board import COLS, EMPTY, GOLD, PIECE_TYPES, ROWS
+from .evaluation import (
+    Evaluator, default_weights_file, evaluate_board, get_evaluator, save_weights,
+)
+from .movegen import generate_turns
+
+CHUNK_SIZE = 16384  # Posiciones leídas del archivo por bloque (acota la memoria)
+BATCH_SIZE = 4096  # Posiciones por paso de gradiente
+SCALE_CANDIDATES = tuple(2.0 ** (e / 2) for e in range(-12, 3))  # Valores de K a probar
+
+_SYMBOLS = "." + "".join(PIECE_TYPES) + "".join(PIECE_TYPES).lower()  # Por código + 1
+_SYMBOL_CODES = {symbol: code - 1 for code, symbol in enumerate(_SYMBOLS)}
+
+
+# Línea de registro de una posición con el resultado para oro
+def format_record(squares, result):
+    return "".join(_SYMBOLS[code + 1] for code in squares) + f" {result:g}"
+
+
+def _open(path, mode="rt"):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode)
+    return open(path, mode)
+
+
+# Agregar a un archivo de registro las posiciones de una partida terminada.
+# `winner` es GOLD, SILVER o None (tablas).
+def write_game_records(path, positions, winner):
+    result = 0.5 if winner is None else 1.0 if winner == GOLD else 0.0
+    with _open(path, "at") as f:
+        for squares in positions:
+            f.write(format_record(squares, result) + "\n")
+
+
+# Leer un registro por bloques: (casillas (n, 64) int8, resultados (n,))
+def iter_chunks(path, chunk_size=CHUNK_SIZE):
+    np = features._numpy()
+    table = np.full(256, EMPTY, dtype=np.int8)
+    for symbol, code in _SYMBOL_CODES.items():
+        table[ord(symbol)] = code
+    size = ROWS * COLS
+    with _open(path) as f:
+        while True:
+            cells = []
+            results = []
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                cells.append(line[:size])
+                results.append(float(line[size:]))
+                if len(cells) == chunk_size:
+                    break
+            if not cells:
+                return
+            raw = np.frombuffer("".join(cells).encode("ascii"), dtype=np.uint8)
+            yield table[raw].reshape(len(cells), size), np.array(results)
+
+
+# Términos (para oro) y resultados de cada bloque del registro
+def iter_feature_chunks(path, chunk_size=CHUNK_SIZE):
+    for squares, results in iter_chunks(path, chunk_size):
+        yield features.position_features(squares), results
+
+
+def _sigmoid(np, x):
+    return 1.0 / (1.0 + np.exp(-np.clip(x, -500, 500)))
+
+
+# Pesos de una heurística orientados a oro, como espera position_features
+def _gold_weights(np, evaluator):
+    weights = np.asarray(evaluator.weights, dtype=np.float64)
+    return weights if evaluator.color == GOLD else -weights
+
+
+# Error cuadrático medio de la predicción sobre todo el registro, para cada
+# escala de `scales`
+def texel_error(path, evaluator, scales, chunk_size=CHUNK_SIZE):
+    np = features._numpy()
+    scales = np.asarray(scales, dtype=np.float64)
+    weights = _gold_weights(np, evaluator)
+    total = np.zeros(len(scales))
+    count = 0
+    for terms, results in iter_feature_chunks(path, chunk_size):
+        scores = terms @ weights
+        predictions = _sigmoid(np, scores[None, :] * scales[:, None])
+        total += ((results[None, :] - predictions) ** 2).sum(axis=1)
+        count += len(results)
+    if not count:
+        raise ValueError(f"El registro {path} no tiene posiciones")
+    return total / count
+
+
+# Escala K que mejor traduce los puntajes de la heurística a resultados,
+# elegida entre los candidatos en una sola pasada por el registro
+def fit_scale(path, evaluator, candidates=SCALE_CANDIDATES, chunk_size=CHUNK_SIZE):
+    errors = texel_error(path, evaluator, candidates, chunk_size)
+    return candidates[int(errors.argmin())]
+
+
+# Ajustar los pesos de una heurística. Primero se fija K con los pesos
+# iniciales y después se hacen `epochs` pasadas por el registro con pasos de
+# Adam sobre lotes de batch_size posiciones, mezcladas dentro de cada bloque.
+# Devuelve la heurística con los pesos nuevos y el error de cada pasada.
+def tune(path, evaluator="board", epochs=4, learning_rate=0.01, scale=None,
+         chunk_size=CHUNK_SIZE, batch_size=BATCH_SIZE, seed=0, name=None):
+    np = features._numpy()
+    if isinstance(evaluator, str):
+        evaluator = get_evaluator(evaluator)
+    if scale is None:
+        scale = fit_scale(path, evaluator, chunk_size=chunk_size)
+    rng = np.random.default_rng(seed)
+    weights = _gold_weights(np, evaluator)
+    first_moment = np.zeros_like(weights)
+    second_moment = np.zeros_like(weights)
+    beta1, beta2, epsilon = 0.9, 0.999, 1e-8
+    steps = 0
+    errors = []
+    for _ in range(epochs):
+        total = 0.0
+        count = 0
+        for terms, results in iter_feature_chunks(path, chunk_size):
+            order = rng.permutation(len(results))
+            for start in range(0, len(order), batch_size):
+                batch = order[start:start + batch_size]
+                x = terms[batch]
+                predictions = _sigmoid(np, scale * (x @ weights))
+                residuals = predictions - results[batch]
+                total += (residuals ** 2).sum()
+                count += len(batch)
+                # Derivada del error cuadrático medio respecto de los pesos
+                gradient = (2 * scale / len(batch)) * (
+                    (residuals * predictions * (1 - predictions)) @ x
+                )
+                steps += 1
+                first_moment = beta1 * first_moment + (1 - beta1) * gradient
+                second_moment = beta2 * second_moment + (1 - beta2) * gradient ** 2
+                corrected = first_moment / (1 - beta1 ** steps)
+                weights = weights - learning_rate * corrected / (
+                    np.sqrt(second_moment / (1 - beta2 ** steps)) + epsilon
+                )
+        errors.append(float(total / count) if count else 0.0)
+    if evaluator.color != GOLD:
+        weights = -weights
+    tuned = Evaluator(name or evaluator.name, [round(float(w), 6) for w in weights], evaluator.color)
+    return tuned, scale, errors
+
+
+# Jugar una partida de la IA contra sí misma con match.play_game y devolver
+# las casillas de cada posición al empezar un turno y el ganador (None si se
+# llega a max_turns). Con probabilidad `randomness` se juega un turno al azar,
+# para que las partidas no se repitan y cubran posiciones variadas.
+def self_play_game(seed, depth=1, max_turns=120, randomness=0.2, evaluate=evaluate_board):
+    from .match import Engine, play_game  # match importa este módulo
+
+    rng = random.Random(seed)
+
+    def random_turn(state):
+        if rng.random() >= randomness:
+            return None
+        turns = generate_turns(state.board, state.turn)
+        return rng.choice(turns) if turns else None
+
+    engine = Engine("selfplay", evaluate, depth)
+    result, _, positions = play_game(seed, engine, engine, max_turns, random_turn)
+    return positions, result
+
+
+def self_play(path, games, seed=0, **options):
+    for game in range(games):
+        positions, result = self_play_game(seed + game, **options)
+        write_game_records(path, positions, result)
+        print(f"partida {game + 1}/{games}: {len(positions)} turnos, gana "
+              f"{'nadie' if result is None else 'oro' if result == GOLD else 'plata'}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ajuste de los pesos de las heurísticas de Arimaa")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    play = commands.add_parser("selfplay", help="generar registros con partidas de la IA contra sí misma")
+    play.add_argument("--games", type=int, default=100)
+    play.add_argument("--output", required=True, help="archivo de registro (se agrega al final)")
+    play.add_argument("--seed", type=int, default=0)
+    play.add_argument("--depth", type=int, default=1)
+    play.add_argument("--max-turns", type=int, default=120)
+    play.add_argument("--randomness", type=float, default=0.2)
+
+    fit = commands.add_parser("tune", help="ajustar los pesos con un registro de partidas")
+    fit.add_argument("records", help="archivo de registro (.txt o .gz)")
+    fit.add_argument("--evaluator", default="board", help="heurística inicial del registro")
+    fit.add_argument("--name", help="nombre de la heurística ajustada (por omisión, el de la inicial)")
+    fit.add_argument("--epochs", type=int, default=4)
+    fit.add_argument("--learning-rate", type=float, default=0.01)
+    fit.add_argument("--scale", type=float, help="escala K fija (por omisión se ajusta)")
+    fit.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    fit.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    fit.add_argument("--output", help="archivo de pesos (por omisión, el que carga el motor)")
+    args = parser.parse_args(argv)
+
+    if args.command == "selfplay":
+        self_play(args.output, args.games, args.seed, depth=args.depth,
+                  max_turns=args.max_turns, randomness=args.randomness)
+        return
+
+    tuned, scale, errors = tune(
+        args.records, args.evaluator, args.epochs, args.learning_rate, args.scale,
+        args.chunk_size, args.batch_size, name=args.name,
+    )
+    for epoch, error in enumerate(errors, 1):
+        print(f"pasada {epoch}: error {error:.6f}")
+    print(f"K = {scale:g}")
+    print(tuned)
+    output = args.output or default_weights_file()
+    save_weights(output, [tuned])
+    print(f"pesos guardados en {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+# Imágenes de las piezas para la interfaz. Las 12 imágenes originales son PNG
+# grandes; se escalan una sola vez a TILE_SIZE y se guardan juntas en un atlas
+# (una fila de 12 casillas, en el orden de los códigos de pieza) dentro de
+# .cache/. Las siguientes veces se carga solo el atlas, y solo cuando se dibuja
+# la primera pieza, ya con la ventana creada, para convertirlo al formato de
+# la pantalla con convert_alpha.
+#
+# Uso: python sprites.py [TILE_SIZE]
+# Arma el atlas y compara el tiempo de carga y de blit con las imágenes sueltas.
+import os
+import sys
+import time
+
+import pygame
+
+from arimaa import COLOR_NAMES, PIECE_TYPES
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(BASE_DIR, ".cache")
+
+# Nombre del archivo de cada tipo de pieza, en el orden de PIECE_TYPES
+PIECE_NAMES = {"R": "rabbit", "G": "cat", "D": "dog", "H": "horse", "C": "camel", "E": "elephant"}
+
+# Archivo de cada código de pieza (color * 6 + tipo)
+PIECE_FILES = [
+    os.path.join(BASE_DIR, f"{COLOR_NAMES[code // 6]}_{PIECE_NAMES[PIECE_TYPES[code % 6]]}.png")
+    for code in range(12)
+]
+
+
+# Cargar y redimensionar una imagen suelta
+def load_and_scale_image(path, size):
+    image = pygame.image.load(path)
+    return pygame.transform.scale(image, size)
+
+
+def atlas_path(tile_size):
+    return os.path.join(CACHE_DIR, f"pieces_{tile_size}.png")
+
+
+# Armar el atlas de un tamaño de casilla y guardarlo en disco
+def build_atlas(tile_size, path=None):
+    path = path or atlas_path(tile_size)
+    atlas = pygame.Surface((tile_size * len(PIECE_FILES), tile_size), pygame.SRCALPHA)
+    for code, file in enumerate(PIECE_FILES):
+        atlas.blit(load_and_scale_image(file, (tile_size, tile_size)), (code * tile_size, 0))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    pygame.image.save(atlas, path)
+    return atlas
+
+
+# Atlas del tamaño pedido; se vuelve a armar si falta o si alguna imagen
+# original es más nueva
+def load_atlas(tile_size):
+    path = atlas_path(tile_size)
+    if os.path.exists(path):
+        built = os.path.getmtime(path)
+        if all(os.path.getmtime(file) <= built for file in PIECE_FILES):
+            return pygame.image.load(path)
+    return build_atlas(tile_size, path)
+
+
+# Imágenes por código de pieza: pieces[code]. El atlas se carga al pedir la
+# primera, así que hay que crear la ventana antes de dibujar.
+class PieceImages:
+    def __init__(self, tile_size):
+        self.tile_size = tile_size
+        self.images = None
+
+    def load(self):
+        atlas = load_atlas(self.tile_size).convert_alpha()
+        size = self.tile_size
+        self.images = [atlas.subsurface((code * size, 0, size, size)) for code in range(len(PIECE_FILES))]
+        return self.images
+
+    def __getitem__(self, code):
+        images = self.images if self.images is not None else self.load()
+        return images[code]
+
+
+# Segundos por blit de cada imagen sobre la pantalla
+def blit_cost(screen, images, repeat=200):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for image in images:
+            screen.blit(image, (0, 0))
+    return (time.perf_counter() - start) / (repeat * len(images))
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    tile_size = int(argv[0]) if argv else 80
+    pygame.init()
+    screen = pygame.display.set_mode((tile_size * 8, tile_size * 8))
+
+    start = time.perf_counter()
+    loose = [load_and_scale_image(file, (tile_size, tile_size)) for file in PIECE_FILES]
+    loose_load = time.perf_counter() - start
+
+    start = time.perf_counter()
+    build_atlas(tile_size)
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    pieces = PieceImages(tile_size)
+    converted = pieces.load()
+    atlas_load = time.perf_counter() - start
+
+    print(f"atlas {atlas_path(tile_size)} armado en {build:.3f} s")
+    print(f"carga: imágenes sueltas {loose_load * 1000:.1f} ms, atlas {atlas_load * 1000:.1f} ms")
+    print(f"blit: sin convertir {blit_cost(screen, loose) * 1e6:.1f} us, "
+          f"con convert_alpha {blit_cost(screen, converted) * 1e6:.1f} us")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()